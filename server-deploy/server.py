@@ -2,18 +2,52 @@
 Draw & Guess 游戏服务器 - 独立部署版本
 """
 
+import base64
 import json
 import logging
 import os
+import random
+import selectors
 import socket
+import sys
 import threading
 import time
-from typing import Any, Dict, Optional, Tuple
+from array import array
+from collections import deque
+from functools import lru_cache
+from itertools import islice
+from typing import Any, Deque, Dict, List, Optional, Set, Tuple, Union
+
+try:
+    import orjson
+except ImportError:  # 未安装 orjson 时退回标准库 json
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # 未安装 msgpack 时只使用 JSON 行协议
+    msgpack = None
 
 # ============== 配置 ==============
 DEFAULT_HOST = "0.0.0.0"
 DEFAULT_PORT = 5555
-BUFFER_SIZE = 4096
+BUFFER_SIZE = 64 * 1024
+TIMER_INTERVAL = 1.0  # 房间倒计时广播间隔（秒）
+DRAW_FLUSH_INTERVAL = 0.016  # 绘画批量广播间隔（秒），约一帧
+MAX_MESSAGE_SIZE = 64 * 1024  # 单条消息（一行）的最大字节数，超出视为非法连接
+RECV_COMPACT_THRESHOLD = 32 * 1024  # 接收缓冲已消费前缀超过该长度时压缩
+IOV_MAX = 1024  # 单次 sendmsg 最多提交的缓冲段数（Linux 的 IOV_MAX）
+SESSION_POOL_SIZE = 64  # 断开后保留以供复用的 ClientSession 数量上限
+MAX_SEND_QUEUE_BYTES = 4 * 1024 * 1024  # 单个会话待写出字节上限，超出说明对端不再读取，断开
+# 客户端可设置的数值上限：orjson / msgpack 只能编码 64 位整数，超大值存入房间后每次广播都会失败
+MAX_ROUNDS_LIMIT = 100
+ROUND_TIME_LIMIT = 3600  # 秒
+REST_TIME_LIMIT = 600  # 秒
+GIVE_SCORE_LIMIT = 100  # 单次打分的绝对值上限
+
+# 下行编码：默认 JSON（换行分隔）；客户端在 connect 中声明支持时切换为 MessagePack（4 字节大端长度前缀）
+CODEC_JSON = "json"
+CODEC_MSGPACK = "msgpack"
 
 # 消息类型
 MSG_CONNECT = "connect"
@@ -51,15 +85,224 @@ class Message:
         self.type = msg_type
         self.data = data or {}
 
+    def to_bytes(self) -> bytes:
+        """编码为 UTF-8 JSON 字节串（不含换行分隔符）。"""
+        obj = {"type": self.type, "data": self.data}
+        if orjson is not None:
+            try:
+                return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+            except TypeError:
+                # orjson 不支持超出 64 位的整数等值，退回标准库 json
+                pass
+        return json.dumps(obj, ensure_ascii=False).encode("utf-8")
+
     def to_json(self) -> str:
-        return json.dumps({"type": self.type, "data": self.data})
+        return self.to_bytes().decode("utf-8")
+
+    def to_frame(self, codec: str = CODEC_JSON) -> bytes:
+        """按会话协商的编码生成一帧。"""
+        if codec == CODEC_MSGPACK:
+            body = msgpack.packb({"type": self.type, "data": self.data}, use_bin_type=True)
+            return len(body).to_bytes(4, "big") + body
+        return self.to_bytes() + b"\n"
 
     @classmethod
-    def from_json(cls, json_str: str) -> "Message":
-        obj = json.loads(json_str)
+    def from_json(cls, raw: Union[str, bytes]) -> "Message":
+        obj = orjson.loads(raw) if orjson is not None else json.loads(raw)
         return cls(obj["type"], obj.get("data", {}))
 
 
+# ============== 猜词归一化 ==============
+# 猜词比较时忽略的空白（含全角空格）与中英文标点，预先构建删除表，str.translate 一次遍历完成
+# 与 src/server/game/room.py 的 _DEL_CHARS 保持一致，两个服务器的猜词判定相同
+_DEL_CHARS = " \t\n\r\v\f\u3000,.;:!?'\"-_/\\()[]{}，。；：！？（）【】"
+_TRANS = str.maketrans("", "", _DEL_CHARS)
+
+
+# 只缓存不超过该长度的输入：聊天行最长可达 MAX_MESSAGE_SIZE，按条数限界不足以限制缓存占用的字节数
+NORMALIZE_CACHE_MAX_LEN = 64
+
+
+@lru_cache(maxsize=4096)
+def _normalize_cached(text: str) -> str:
+    return text.lower().translate(_TRANS)
+
+
+def normalize_text(text: Optional[str]) -> str:
+    """猜词归一化：转小写并去掉空白与标点。
+
+    玩家常反复发送相同的候选词，短文本的结果按原文做有界 LRU 缓存。
+    """
+    text = text or ""
+    if len(text) > NORMALIZE_CACHE_MAX_LEN:
+        return text.lower().translate(_TRANS)
+    return _normalize_cached(text)
+
+
+# ============== 绘画增量编码 ==============
+# 坐标字段：line 的终点为 "to"，paint 的落点为 "pos"
+_DRAW_POINT_KEYS = ("from", "to", "pos")
+_DRAW_END_KEY = {"line": "to", "paint": "pos"}
+
+
+def _is_point(p: Any) -> bool:
+    # 每个绘画动作都要检查数次，展开判断以免每次分配生成器
+    return isinstance(p, (list, tuple)) and len(p) == 2 and type(p[0]) is int and type(p[1]) is int
+
+
+def encode_draw_delta(last: Dict[str, Any], data: Dict[str, Any]) -> Dict[str, Any]:
+    """把绘画动作编码为相对同一玩家上一笔（last）的增量。
+
+    - 非坐标字段（kind/color/size/mode...）只发送发生变化的部分；
+    - 终点相对上一笔终点发送 dx/dy；
+    - line 的起点若与上一笔终点重合（连续拖动时总是如此）则省略。
+
+    客户端使用 src.shared.protocols.apply_draw_delta 还原。
+    """
+    delta = {k: v for k, v in data.items() if k not in _DRAW_POINT_KEYS and last.get(k) != v}
+    anchor = last.get(_DRAW_END_KEY.get(last.get("kind"), ""))
+    end_key = _DRAW_END_KEY.get(data.get("kind"))
+    if data.get("kind") == "line" and "from" in data:
+        start = data["from"]
+        # 逐坐标比较，不为 list/tuple 混合比较而复制出两个新列表
+        if not (_is_point(anchor) and _is_point(start) and start[0] == anchor[0] and start[1] == anchor[1]):
+            delta["from"] = start
+    if end_key and end_key in data:
+        end = data[end_key]
+        if _is_point(anchor) and _is_point(end):
+            delta["dx"] = end[0] - anchor[0]
+            delta["dy"] = end[1] - anchor[1]
+        else:
+            delta[end_key] = end
+    return delta
+
+
+# 上行绘画动作的定长位置编码，与 src.shared.protocols.pack_draw_action 对应
+_DRAW_WIRE_LINE = 1
+_DRAW_WIRE_PAINT = 2
+_DRAW_WIRE_RUN = 3
+_DRAW_WIRE_LEN = {_DRAW_WIRE_LINE: 10, _DRAW_WIRE_PAINT: 8}
+
+
+def unpack_draw_action(wire: Any) -> Optional[Dict[str, Any]]:
+    """把定长整数列表还原为 line / paint 动作字典；格式不对时返回 None。"""
+    # 先确认全是 int 再查表：首元素可能是客户端发来的任意（甚至不可哈希的）值
+    if not isinstance(wire, list) or not all(type(v) is int for v in wire):
+        return None
+    if not wire or _DRAW_WIRE_LEN.get(wire[0]) != len(wire):
+        return None
+    mode = "erase" if wire[-1] else "draw"
+    if wire[0] == _DRAW_WIRE_LINE:
+        _, fx, fy, tx, ty, r, g, b, size, _ = wire
+        return {"kind": "line", "from": [fx, fy], "to": [tx, ty], "color": [r, g, b], "size": size, "mode": mode}
+    _, x, y, r, g, b, size, _ = wire
+    return {"kind": "paint", "pos": [x, y], "color": [r, g, b], "size": size, "mode": mode}
+
+
+def unpack_draw_run(wire: Any) -> Optional[Tuple[Dict[str, Any], "array[int]", "array[int]"]]:
+    """解码 [3, r, g, b, size, erase, xy] 折线，返回 (样式, xs, ys)；格式不对时返回 None。"""
+    if not isinstance(wire, list) or len(wire) != 7 or not isinstance(wire[6], str):
+        return None
+    if not all(type(v) is int for v in wire[1:6]):
+        return None
+    values = array("h")
+    try:
+        values.frombytes(base64.b64decode(wire[6], validate=True))
+    except ValueError:
+        return None
+    if sys.byteorder == "big":
+        values.byteswap()
+    n = len(values) // 2
+    if n < 2 or len(values) != 2 * n:
+        return None
+    style = {"color": [wire[1], wire[2], wire[3]], "size": wire[4], "mode": "erase" if wire[5] else "draw"}
+    return style, values[:n], values[n:]
+
+
+def _is_int16_point(p: Any) -> bool:
+    return _is_point(p) and -32768 <= p[0] <= 32767 and -32768 <= p[1] <= 32767
+
+
+class DrawRun:
+    """同一玩家一段连续拖动的折线，坐标以 SoA 形式存放在两个 int16 数组中。
+
+    连续的 line 动作颜色/粗细/模式相同且首尾相接，合并后线上只需传输
+    每个点 4 个字节，而不是每段一个完整的 JSON 对象。
+    """
+
+    # 绘画时每一帧都会创建，用 __slots__ 省去每个实例的 __dict__
+    __slots__ = ("sess", "first", "last", "color", "size", "mode", "xs", "ys")
+
+    def __init__(self, sess: "ClientSession", data: Dict[str, Any]):
+        self.sess = sess
+        self.first = data
+        self.last = data
+        self.color = data.get("color")
+        self.size = data.get("size")
+        self.mode = data.get("mode")
+        self.xs = array("h", (data["from"][0], data["to"][0]))
+        self.ys = array("h", (data["from"][1], data["to"][1]))
+
+    @staticmethod
+    def accepts(data: Dict[str, Any]) -> bool:
+        return data.get("kind") == "line" and _is_int16_point(data.get("from")) and _is_int16_point(data.get("to"))
+
+    def extend(self, sess: "ClientSession", data: Dict[str, Any]) -> bool:
+        """若 data 紧接本折线末端且样式相同，则追加终点并返回 True。"""
+        if (
+            sess is not self.sess
+            or not self.accepts(data)
+            or data.get("color") != self.color
+            or data.get("size") != self.size
+            or data.get("mode") != self.mode
+            or data["from"][0] != self.xs[-1]
+            or data["from"][1] != self.ys[-1]
+        ):
+            return False
+        self.xs.append(data["to"][0])
+        self.ys.append(data["to"][1])
+        self.last = data
+        return True
+
+    def append_points(self, xs: "array[int]", ys: "array[int]", last: Dict[str, Any]) -> None:
+        """追加客户端已合并好的后续折线点；last 为最后一段对应的 line 动作。"""
+        self.xs.extend(xs)
+        self.ys.extend(ys)
+        self.last = last
+
+    def to_wire(self) -> Dict[str, Any]:
+        """编码为 {"c", "s", "m", "xy"}，xy 为小端 int16 的 xs 后接 ys 再做 base64。"""
+        xs, ys = array("h", self.xs), array("h", self.ys)
+        if sys.byteorder == "big":
+            xs.byteswap()
+            ys.byteswap()
+        return {
+            "c": self.color,
+            "s": self.size,
+            "m": self.mode,
+            "xy": base64.b64encode(xs.tobytes() + ys.tobytes()).decode("ascii"),
+        }
+
+
+def encode_draw_batch(items: List[Any]) -> List[Dict[str, Any]]:
+    """把房间内积攒的绘画条目（DrawRun 或 (会话, 动作)）按顺序编码为 strokes 列表。"""
+    strokes = []
+    for item in items:
+        if isinstance(item, DrawRun) and len(item.xs) > 2:
+            stroke = item.to_wire()
+            stroke["by"] = item.sess.player_id
+            item.sess.last_draw = item.last
+            strokes.append(stroke)
+            continue
+        # 只有一段的折线不值得打包，按普通增量发送
+        sess, data = (item.sess, item.first) if isinstance(item, DrawRun) else item
+        delta = encode_draw_delta(sess.last_draw, data)
+        # 清屏后两端都从空状态重新开始
+        sess.last_draw = {} if data.get("kind") == "clear" else data
+        strokes.append({"by": sess.player_id, "d": delta})
+    return strokes
+
+
 # ============== 游戏房间 ==============
 class GameRoom:
     def __init__(self, room_id: str):
@@ -76,6 +319,11 @@ class GameRoom:
         self.round_start_time: Optional[float] = None
         self.words_list = []  # 词库
         self.used_words = set()  # 已使用的词
+        # 绘画者轮换队列：队首为下一位绘画者，加入/离开时增删，开局时洗牌
+        self._drawer_cycle: Deque[str] = deque()
+        # room_update 编码缓存：状态键未变化时复用上次编码好的帧（按编码区分）
+        self._last_public_state_key: Optional[tuple] = None
+        self._last_public_state_frames: Dict[str, bytes] = {}
         self._load_words()
 
     def add_player(self, player_id: str, player_name: str) -> bool:
@@ -86,6 +334,7 @@ class GameRoom:
             "score": 0,
             "is_drawer": False
         }
+        self._drawer_cycle.append(player_id)
         if self.owner_id is None:
             self.owner_id = player_id
         return True
@@ -93,11 +342,26 @@ class GameRoom:
     def remove_player(self, player_id: str):
         if player_id in self.players:
             del self.players[player_id]
+            self._drawer_cycle.remove(player_id)
             if self.owner_id == player_id:
                 self.owner_id = next(iter(self.players), None)
             if self.drawer_id == player_id:
                 self.drawer_id = None
 
+    def rebuild_drawer_cycle(self) -> None:
+        """按随机顺序重建绘画者轮换队列（开局时调用）。"""
+        order = list(self.players)
+        random.shuffle(order)
+        self._drawer_cycle = deque(order)
+
+    def next_drawer(self) -> Optional[str]:
+        """轮换出下一位绘画者：取出队首并放回队尾。"""
+        if not self._drawer_cycle:
+            return None
+        player_id = self._drawer_cycle.popleft()
+        self._drawer_cycle.append(player_id)
+        return player_id
+
     def _load_words(self):
         """加载词库"""
         try:
@@ -117,11 +381,11 @@ class GameRoom:
     def set_game_config(self, max_rounds: int = None, round_time: int = None, rest_time: int = None):
         """设置游戏参数"""
         if max_rounds is not None and max_rounds > 0:
-            self.max_rounds = max_rounds
+            self.max_rounds = min(max_rounds, MAX_ROUNDS_LIMIT)
         if round_time is not None and round_time > 0:
-            self.round_time = round_time
+            self.round_time = min(round_time, ROUND_TIME_LIMIT)
         if rest_time is not None and rest_time > 0:
-            self.rest_time = rest_time
+            self.rest_time = min(rest_time, REST_TIME_LIMIT)
 
     def get_time_left(self, now: Optional[float] = None) -> int:
         """计算当前轮剩余时间（秒），由服务器统一计算并广播。"""
@@ -134,7 +398,6 @@ class GameRoom:
 
     def get_next_word(self) -> str:
         """获取下一个词语"""
-        import random
         available = [w for w in self.words_list if w not in self.used_words]
         if not available:
             self.used_words.clear()  # 重置已使用词库
@@ -145,8 +408,7 @@ class GameRoom:
             return word
         return "画画"
 
-    def get_public_state(self) -> dict:
-        now = time.time()
+    def get_public_state(self, now: Optional[float] = None) -> dict:
         time_left = self.get_time_left(now)
         return {
             "room_id": self.room_id,
@@ -165,19 +427,68 @@ class GameRoom:
             "time_left": time_left,
         }
 
+    def _public_state_key(self, now: float) -> tuple:
+        """get_public_state 结果的内容键，相同的键编码出相同的字节。"""
+        players = tuple((pid, tuple(p.values())) for pid, p in self.players.items())
+        return (
+            self.owner_id, self.status, self.drawer_id, self.round_number, self.max_rounds,
+            self.round_time, self.rest_time, self.current_word, self.get_time_left(now), players,
+        )
+
+    def public_state_frame(self, codec: str) -> bytes:
+        """返回 room_update 的已编码帧；状态与上次相同时不再重新编码。"""
+        now = time.time()
+        key = self._public_state_key(now)
+        if key != self._last_public_state_key:
+            self._last_public_state_key = key
+            self._last_public_state_frames = {}
+        frame = self._last_public_state_frames.get(codec)
+        if frame is None:
+            msg = Message(MSG_ROOM_UPDATE, self.get_public_state(now))
+            frame = self._last_public_state_frames[codec] = msg.to_frame(codec)
+        return frame
+
 
 # ============== 客户端会话 ==============
 class ClientSession:
+    __slots__ = (
+        "sock", "addr", "player_id", "player_name", "room_id", "recv_buf", "recv_head",
+        "send_queue", "send_queued", "want_write", "closed", "last_draw", "codec",
+    )
+
     def __init__(self, sock: socket.socket, addr: Tuple[str, int]):
+        # 非阻塞收发缓冲：recv_buf 存放未成帧的字节，send_queue 存放待写出的帧
+        self.recv_buf = bytearray()
+        self.send_queue: Deque[Union[bytes, memoryview]] = deque()
+        self.reset(sock, addr)
+
+    def reset(self, sock: socket.socket, addr: Tuple[str, int]) -> None:
+        """绑定到新连接并清空会话状态；缓冲对象本身保留，供会话池复用。"""
         self.sock = sock
         self.addr = addr
         self.player_id: Optional[str] = None
         self.player_name: Optional[str] = None
         self.room_id: Optional[str] = None
+        self.recv_buf.clear()
+        self.recv_head = 0  # recv_buf 中尚未处理数据的起始偏移
+        self.send_queue.clear()
+        self.send_queued = 0  # send_queue 中尚未写出的字节数
+        self.want_write = False
+        self.closed = False
+        # 本会话上一笔绘画动作，用于增量编码（加入房间或清屏时重置）
+        self.last_draw: Dict[str, Any] = {}
+        # 下行编码，connect 握手时协商；上行始终是 JSON 行
+        self.codec = CODEC_JSON
 
 
 # ============== 网络服务器 ==============
 class NetworkServer:
+    """单线程事件循环服务器。
+
+    所有会话由一个 selectors 循环驱动（Linux 上即 epoll），套接字均为非阻塞；
+    房间与会话状态只在事件循环线程内访问，因此不需要加锁。
+    """
+
     def __init__(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT):
         self.host = host
         self.port = port
@@ -185,7 +496,22 @@ class NetworkServer:
         self._running = threading.Event()
         self.sessions: Dict[Tuple[str, int], ClientSession] = {}
         self.rooms: Dict[str, GameRoom] = {}
-        self._lock = threading.Lock()
+        self._sel: Optional[selectors.BaseSelector] = None
+        self._loop_thread: Optional[threading.Thread] = None
+        # 待合并广播的绘画：room_id -> [DrawRun 或 (发送者会话, 动作数据)]
+        self._pending_draw: Dict[str, List[Any]] = {}
+        self._draw_deadline: Optional[float] = None
+        # 房间成员索引：room_id -> 会话集合，广播时无需扫描全部会话
+        self.room_members: Dict[str, Set[ClientSession]] = {}
+        # 玩家索引：player_id -> 会话，踢人等按玩家查找时为 O(1)
+        self.sessions_by_player: Dict[str, ClientSession] = {}
+        # 本轮循环中有新数据待写出的会话，循环末尾统一 flush
+        self._dirty: Set[ClientSession] = set()
+        # 事件循环是单线程的，所有会话共用一块接收缓冲，避免每次 recv 分配新 bytes
+        self._recv_view = memoryview(bytearray(BUFFER_SIZE))
+        # 会话池：断开的会话先进入 _retired，待没有绘画条目再引用它们时才移入 _session_pool
+        self._session_pool: List[ClientSession] = []
+        self._retired: List[ClientSession] = []
 
     def _rooms_snapshot(self) -> list:
         """构建当前房间的简要列表快照。"""
@@ -200,11 +526,11 @@ class NetworkServer:
 
     def broadcast_all(self, msg: Message, exclude: Optional[ClientSession] = None) -> None:
         """向所有会话广播消息。"""
-        with self._lock:
-            for sess in list(self.sessions.values()):
-                if exclude and sess is exclude:
-                    continue
-                self._send(sess, msg)
+        frames: Dict[str, bytes] = {}
+        for sess in list(self.sessions.values()):
+            if exclude and sess is exclude:
+                continue
+            self._send_bytes(sess, self._frame_for(sess, msg, frames))
 
     def broadcast_rooms_update(self) -> None:
         """向所有连接广播房间列表更新。"""
@@ -221,95 +547,324 @@ class NetworkServer:
             logger.error("端口 %s 已被占用，无法启动独立服务器。请停止其他服务器或修改 PORT 环境变量。", self.port)
             raise
         self.sock.listen(32)
+        self.sock.setblocking(False)
+        self._sel = selectors.DefaultSelector()
+        # data=None 表示监听套接字，其余注册项的 data 为 ClientSession
+        self._sel.register(self.sock, selectors.EVENT_READ, data=None)
         self._running.set()
-        threading.Thread(target=self._accept_loop, daemon=True).start()
-        # 服务器端计时循环：周期性广播每个房间的 time_left
-        threading.Thread(target=self._timer_loop, daemon=True).start()
+        self._loop_thread = threading.Thread(target=self._event_loop, name="event-loop", daemon=True)
+        self._loop_thread.start()
 
     def stop(self) -> None:
         self._running.clear()
-        if self.sock:
-            try:
-                self.sock.close()
-            except Exception:
-                pass
+        # 事件循环最多阻塞 TIMER_INTERVAL 秒，退出时由循环自身释放套接字
+        if self._loop_thread and self._loop_thread is not threading.current_thread():
+            self._loop_thread.join(timeout=TIMER_INTERVAL * 2)
+
+    def _event_loop(self) -> None:
+        """事件循环：处理 accept / 读 / 写，合并广播绘画，并按秒推进房间计时广播。
 
-    def _accept_loop(self) -> None:
-        while self._running.is_set():
+        异常按事件 / 按步骤捕获并记录，单个连接或房间出错不会停掉整个服务器。
+        """
+        next_tick = time.time() + TIMER_INTERVAL
+        try:
+            while self._running.is_set():
+                deadline = next_tick
+                if self._draw_deadline is not None:
+                    deadline = min(deadline, self._draw_deadline)
+                timeout = max(0.0, deadline - time.time())
+                for key, mask in self._sel.select(timeout):
+                    try:
+                        if key.data is None:
+                            self._accept()
+                            continue
+                        sess = key.data
+                        if mask & selectors.EVENT_READ:
+                            self._on_readable(sess)
+                        if mask & selectors.EVENT_WRITE and not sess.closed:
+                            self._flush(sess)
+                    except Exception:
+                        logger.exception("处理连接事件出错: %s", getattr(key.data, "addr", "listener"))
+                now = time.time()
+                if self._draw_deadline is not None and now >= self._draw_deadline:
+                    self._flush_draws()
+                if now >= next_tick:
+                    self._timer_tick(now)
+                    next_tick = now + TIMER_INTERVAL
+                try:
+                    self._flush_dirty()
+                    if self._retired and not self._pending_draw:
+                        self._recycle_sessions()
+                except Exception:
+                    logger.exception("写出待发数据出错")
+        except Exception:
+            logger.exception("事件循环异常退出")
+        finally:
+            for sess in list(self.sessions.values()):
+                self._close_socket(sess)
+            self.sessions.clear()
+            if self.sock:
+                try:
+                    self._sel.unregister(self.sock)
+                except Exception:
+                    pass
+                try:
+                    self.sock.close()
+                except Exception:
+                    pass
+            self._sel.close()
+
+    def _accept(self) -> None:
+        """接受所有已就绪的新连接并注册到事件循环。"""
+        while True:
             try:
                 client_sock, addr = self.sock.accept()
+            except (BlockingIOError, InterruptedError):
+                return
+            except OSError:
+                return
+            client_sock.setblocking(False)
+            # 绘画/聊天都是很短的行消息，关闭 Nagle 避免每笔最多约 40ms 的合并延迟
+            client_sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            client_sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+            if self._session_pool:
+                sess = self._session_pool.pop()
+                sess.reset(client_sock, addr)
+            else:
                 sess = ClientSession(client_sock, addr)
-                with self._lock:
-                    self.sessions[addr] = sess
-                threading.Thread(target=self._session_loop, args=(sess,), daemon=True).start()
-                logger.info(f"客户端连接: {addr}")
+            self.sessions[addr] = sess
+            self._sel.register(client_sock, selectors.EVENT_READ, data=sess)
+            logger.info(f"客户端连接: {addr}")
+
+    def _timer_tick(self, now: float) -> None:
+        """服务器端计时：每秒广播一次房间倒计时。"""
+        for room in list(self.rooms.values()):
+            if room.status != "playing":
+                continue
+            payload = {
+                "room_id": room.room_id,
+                "round_number": room.round_number,
+                "max_rounds": room.max_rounds,
+                "round_duration": room.round_time,
+                "time_left": room.get_time_left(now),
+                "drawer_id": room.drawer_id,
+                "current_word": room.current_word,
+            }
+            try:
+                self.broadcast_room(room.room_id, Message("room_state", payload))
             except Exception:
-                if self._running.is_set():
-                    pass
+                logger.exception("房间 %s 计时广播出错", room.room_id)
 
-    def _timer_loop(self) -> None:
-        """服务器端计时循环：每秒广播一次房间倒计时。"""
-        while self._running.is_set():
+    def _flush_draws(self) -> None:
+        """把每个房间积攒的绘画动作合并成一条 draw_sync_batch 广播出去。"""
+        pending = self._pending_draw
+        self._pending_draw = {}
+        self._draw_deadline = None
+        for room_id, items in pending.items():
+            if not items or room_id not in self.rooms:
+                continue
+            senders = {item.sess if isinstance(item, DrawRun) else item[0] for item in items}
             try:
-                now = time.time()
-                with self._lock:
-                    rooms = list(self.rooms.values())
-                for room in rooms:
-                    if room.status != "playing":
-                        continue
-                    payload = {
-                        "room_id": room.room_id,
-                        "round_number": room.round_number,
-                        "max_rounds": room.max_rounds,
-                        "round_duration": room.round_time,
-                        "time_left": room.get_time_left(now),
-                        "drawer_id": room.drawer_id,
-                        "current_word": room.current_word,
-                    }
-                    self.broadcast_room(room.room_id, Message("room_state", payload))
+                strokes = encode_draw_batch(items)
+                # 只有一个人在画时（常见情况）不必回传给画手本人
+                exclude = next(iter(senders)) if len(senders) == 1 else None
+                self.broadcast_room(room_id, Message("draw_sync_batch", {"strokes": strokes}), exclude=exclude)
             except Exception:
-                pass
-            time.sleep(1)
+                logger.exception("房间 %s 绘画广播出错", room_id)
+
+    def _queue_draw(self, sess: ClientSession, data: Dict[str, Any]) -> None:
+        """不逐条转发，交给事件循环每 DRAW_FLUSH_INTERVAL 合并广播一次。"""
+        # 合并广播在单条消息的异常保护之外执行，格式不对的动作必须在入队前丢弃
+        if not isinstance(data, dict) or type(data.get("kind")) is not str:
+            return
+        pending = self._pending_draw.setdefault(sess.room_id, [])
+        tail = pending[-1] if pending else None
+        if not (isinstance(tail, DrawRun) and tail.extend(sess, data)):
+            pending.append(DrawRun(sess, data) if DrawRun.accepts(data) else (sess, data))
+        if self._draw_deadline is None:
+            self._draw_deadline = time.time() + DRAW_FLUSH_INTERVAL
+
+    def _queue_draw_run(self, sess: ClientSession, style: Dict[str, Any], xs: "array[int]", ys: "array[int]") -> None:
+        """排入客户端合并好的折线：首段走 _queue_draw，其余点直接追加到该 DrawRun。"""
+        first = {"kind": "line", "from": [xs[0], ys[0]], "to": [xs[1], ys[1]], **style}
+        self._queue_draw(sess, first)
+        if len(xs) > 2:
+            last = {"kind": "line", "from": [xs[-2], ys[-2]], "to": [xs[-1], ys[-1]], **style}
+            # 首段必然被 DrawRun 接收（坐标已是 int16），它此时位于队尾
+            self._pending_draw[sess.room_id][-1].append_points(xs[2:], ys[2:], last)
+
+    def _reset_draw_state(self, room_id: str, joiner: ClientSession) -> None:
+        """joiner 进入房间前重置该房间的增量编码基准，保证新成员能完整还原笔画。
+
+        必须在 _set_room 之前调用：按旧基准编码的增量只发给原有成员。
+        """
+        self._flush_draws()
+        for sess in self.room_members.get(room_id, ()):
+            sess.last_draw = {}
+        joiner.last_draw = {}
+
+    def _set_room(self, sess: ClientSession, room_id: Optional[str]) -> None:
+        """更新会话所在房间，并同步维护 room_members 索引。"""
+        if sess.room_id is not None:
+            members = self.room_members.get(sess.room_id)
+            if members is not None:
+                members.discard(sess)
+                if not members:
+                    del self.room_members[sess.room_id]
+        sess.room_id = room_id
+        if room_id is not None:
+            self.room_members.setdefault(room_id, set()).add(sess)
+
+    def _on_readable(self, sess: ClientSession) -> None:
+        """读取可用数据，按换行符切分出完整消息并逐条路由。"""
+        view = self._recv_view
+        buf = sess.recv_buf
+        # 最后一个换行之后（尚未成帧）数据的起始偏移；已处理到 recv_head，其后没有换行
+        unframed = sess.recv_head
+        while True:
+            try:
+                n = sess.sock.recv_into(view)
+            except (BlockingIOError, InterruptedError):
+                break
+            except OSError:
+                n = 0
+            if not n:
+                self._cleanup_session(sess)
+                return
+            buf += view[:n]
+            nl = buf.rfind(b"\n", len(buf) - n)
+            if nl >= 0:
+                unframed = nl + 1
+            # 未成帧数据已超限时停止读取，由下方的检查断开，不让一次可读事件无限缓冲对端数据
+            if len(buf) - unframed > MAX_MESSAGE_SIZE:
+                break
+            # 没有读满说明内核缓冲已经读空，直接回到 select 等待，省去一次必然 EAGAIN 的 recv
+            if n < len(view):
+                break
+        # 用游标前移代替逐条切除已处理的前缀，避免每条消息都搬移剩余字节
+        head = sess.recv_head
+        while not sess.closed:
+            idx = buf.find(b"\n", head)
+            if idx < 0:
+                break
+            if idx - head > MAX_MESSAGE_SIZE:
+                # 超长行直接丢弃，不做解析，避免为其分配整棵对象树
+                logger.warning("丢弃超长消息 (%d 字节): %s", idx - head, sess.addr)
+                head = idx + 1
+                continue
+            raw = bytes(buf[head:idx])
+            head = idx + 1
+            try:
+                self._handle_raw_message(sess, raw)
+            except Exception:
+                logger.exception("处理消息出错: %s", sess.addr)
+        if head >= len(buf):
+            buf.clear()
+            head = 0
+        elif head > RECV_COMPACT_THRESHOLD or head > len(buf) // 2:
+            del buf[:head]
+            head = 0
+        sess.recv_head = head
+        if len(buf) - head > MAX_MESSAGE_SIZE and not sess.closed:
+            # 迟迟不出现换行的数据流不是合法客户端，断开以限制缓冲占用
+            logger.warning("未成帧数据超过 %d 字节，断开: %s", MAX_MESSAGE_SIZE, sess.addr)
+            self._cleanup_session(sess)
+
+    def _flush_dirty(self) -> None:
+        """写出本轮循环中产生的所有待发数据。"""
+        # 断开清理时可能再次广播而产生新的待写会话，因此循环到清空为止
+        while self._dirty:
+            dirty, self._dirty = self._dirty, set()
+            for sess in dirty:
+                if not sess.closed:
+                    self._flush(sess)
 
-    def _session_loop(self, sess: ClientSession) -> None:
-        buf = bytearray()
+    def _flush(self, sess: ClientSession) -> None:
+        """用 sendmsg 一次系统调用写出队列中的多帧；写不完则关注 EVENT_WRITE。"""
+        queue = sess.send_queue
+        while queue:
+            chunks = list(islice(queue, IOV_MAX))
+            try:
+                if hasattr(sess.sock, "sendmsg"):
+                    sent = sess.sock.sendmsg(chunks)
+                else:
+                    sent = sess.sock.send(b"".join(chunks))
+            except (BlockingIOError, InterruptedError):
+                break
+            except OSError:
+                self._cleanup_session(sess)
+                return
+            total = sum(len(c) for c in chunks)
+            sess.send_queued -= sent
+            # 弹出已完整写出的帧，部分写出的帧保留剩余部分
+            remaining = sent
+            while remaining:
+                head = queue[0]
+                if remaining >= len(head):
+                    queue.popleft()
+                    remaining -= len(head)
+                else:
+                    queue[0] = memoryview(head)[remaining:]
+                    remaining = 0
+            if sent < total:
+                # 内核发送缓冲已满，等待可写事件
+                break
+        if sess.send_queued > MAX_SEND_QUEUE_BYTES:
+            # 对端长期不读时不能无限缓存广播：在此断开（不在广播遍历中途，可安全修改房间索引）
+            logger.warning("待发送数据超过 %d 字节，断开: %s", MAX_SEND_QUEUE_BYTES, sess.addr)
+            self._cleanup_session(sess)
+            return
+        want_write = bool(queue)
+        if want_write != sess.want_write:
+            events = selectors.EVENT_READ | selectors.EVENT_WRITE if want_write else selectors.EVENT_READ
+            self._sel.modify(sess.sock, events, data=sess)
+            sess.want_write = want_write
+
+    def _close_socket(self, sess: ClientSession) -> None:
+        sess.closed = True
         try:
-            while self._running.is_set():
-                data = sess.sock.recv(BUFFER_SIZE)
-                if not data:
-                    break
-                buf.extend(data)
-                while b"\n" in buf:
-                    idx = buf.index(b"\n")
-                    raw = bytes(buf[:idx])
-                    buf = buf[idx + 1:]
-                    self._handle_raw_message(sess, raw)
+            self._sel.unregister(sess.sock)
         except Exception:
             pass
-        finally:
-            self._cleanup_session(sess)
-
-    def _cleanup_session(self, sess: ClientSession) -> None:
-        with self._lock:
-            if sess.addr in self.sessions:
-                del self.sessions[sess.addr]
-            if sess.room_id and sess.room_id in self.rooms:
-                room = self.rooms[sess.room_id]
-                if sess.player_id:
-                    room.remove_player(sess.player_id)
-                    self.broadcast_room(sess.room_id, Message(MSG_ROOM_UPDATE, room.get_public_state()))
-                    if not room.players:
-                        del self.rooms[sess.room_id]
         try:
             sess.sock.close()
         except Exception:
             pass
+
+    def _cleanup_session(self, sess: ClientSession) -> None:
+        if sess.closed:
+            return
+        self._close_socket(sess)
+        self.sessions.pop(sess.addr, None)
+        if sess.player_id and self.sessions_by_player.get(sess.player_id) is sess:
+            del self.sessions_by_player[sess.player_id]
+        room_id = sess.room_id
+        self._set_room(sess, None)
+        self._retired.append(sess)
         logger.info(f"客户端断开: {sess.addr}")
+        if room_id and room_id in self.rooms:
+            room = self.rooms[room_id]
+            if sess.player_id:
+                room.remove_player(sess.player_id)
+                # 先删空房间再广播：广播出错也不会留下无人的房间
+                if not room.players:
+                    del self.rooms[room_id]
+                else:
+                    self.broadcast_room_update(room)
+
+    def _recycle_sessions(self) -> None:
+        """把已断开的会话放回会话池，超出上限的交给 GC。"""
+        retired, self._retired = self._retired, []
+        free = SESSION_POOL_SIZE - len(self._session_pool)
+        for sess in retired[:max(0, free)]:
+            sess.sock = None
+            sess.send_queue.clear()
+            sess.recv_buf.clear()
+            self._session_pool.append(sess)
 
     def _handle_raw_message(self, sess: ClientSession, raw: bytes) -> None:
         try:
-            text = raw.decode("utf-8", errors="ignore")
-            msg = Message.from_json(text)
+            msg = Message.from_json(raw)
         except Exception:
             return
         self._route_message(sess, msg)
@@ -320,9 +875,20 @@ class NetworkServer:
         logger.info(f"收到消息: type={t}, from={sess.player_name or sess.addr}")
 
         if t == MSG_CONNECT:
-            sess.player_id = str(data.get("player_id") or sess.addr[0])
+            if sess.player_id and self.sessions_by_player.get(sess.player_id) is sess:
+                del self.sessions_by_player[sess.player_id]
+            # player_id 会作为 room.players / 索引的键并写进每条广播，驻留后各处共享同一个对象
+            sess.player_id = sys.intern(str(data.get("player_id") or sess.addr[0]))
             sess.player_name = str(data.get("name") or f"Player-{sess.addr[1]}")
-            self._send(sess, Message("ack", {"ok": True, "event": MSG_CONNECT}))
+            self.sessions_by_player[sess.player_id] = sess
+            ack = {"ok": True, "event": MSG_CONNECT, "draw_wire": True}
+            codecs = data.get("codecs")
+            use_msgpack = msgpack is not None and isinstance(codecs, list) and CODEC_MSGPACK in codecs
+            if use_msgpack:
+                ack["codec"] = CODEC_MSGPACK
+            # ack 本身仍以 JSON 行发出，之后的下行帧才切换编码
+            self._send(sess, Message("ack", ack))
+            sess.codec = CODEC_MSGPACK if use_msgpack else CODEC_JSON
 
         elif t == MSG_CREATE_ROOM:
             room_id = str(len(self.rooms) + 1)
@@ -330,9 +896,10 @@ class NetworkServer:
             self.rooms[room_id] = new_room
             if sess.player_id and sess.player_name:
                 new_room.add_player(sess.player_id, sess.player_name)
-                sess.room_id = room_id
+                self._reset_draw_state(room_id, sess)
+                self._set_room(sess, room_id)
                 self._send(sess, Message("ack", {"ok": True, "event": MSG_CREATE_ROOM, "room_id": room_id}))
-                self.broadcast_room(room_id, Message(MSG_ROOM_UPDATE, new_room.get_public_state()))
+                self.broadcast_room_update(new_room)
                 # 广播房间列表更新，便于其他客户端立刻看到新房间
                 self.broadcast_rooms_update()
 
@@ -352,7 +919,8 @@ class NetworkServer:
                 room = self.rooms[target_room_id]
                 if sess.player_id and sess.player_name:
                     if room.add_player(sess.player_id, sess.player_name):
-                        sess.room_id = target_room_id
+                        self._reset_draw_state(target_room_id, sess)
+                        self._set_room(sess, target_room_id)
                         # 容错：若房主缺失，指定为已有的第一个玩家
                         if room.owner_id is None:
                             try:
@@ -360,7 +928,7 @@ class NetworkServer:
                             except Exception:
                                 room.owner_id = sess.player_id
                         self._send(sess, Message("ack", {"ok": True, "event": MSG_JOIN_ROOM, "room_id": target_room_id}))
-                        self.broadcast_room(target_room_id, Message(MSG_ROOM_UPDATE, room.get_public_state()))
+                        self.broadcast_room_update(room)
                         self.broadcast_rooms_update()
                     else:
                         self._send(sess, Message("error", {"msg": "Could not join room"}))
@@ -372,11 +940,11 @@ class NetworkServer:
                 room = self.rooms[sess.room_id]
                 if sess.player_id:
                     room.remove_player(sess.player_id)
-                    self.broadcast_room(sess.room_id, Message(MSG_ROOM_UPDATE, room.get_public_state()))
+                    self.broadcast_room_update(room)
                     self.broadcast_rooms_update()
                     if not room.players:
                         del self.rooms[sess.room_id]
-            sess.room_id = None
+            self._set_room(sess, None)
             self._send(sess, Message("ack", {"ok": True, "event": MSG_LEAVE_ROOM}))
 
         elif t == MSG_KICK_PLAYER:
@@ -386,13 +954,12 @@ class NetworkServer:
                 if room.owner_id == sess.player_id:
                     if target_player_id in room.players:
                         room.remove_player(target_player_id)
-                        self.broadcast_room(sess.room_id, Message(MSG_ROOM_UPDATE, room.get_public_state()))
+                        self.broadcast_room_update(room)
                         self.broadcast_rooms_update()
-                        for s in self.sessions.values():
-                            if s.player_id == target_player_id:
-                                s.room_id = None
-                                self._send(s, Message("event", {"type": MSG_KICK_PLAYER, "room_id": room.room_id}))
-                                break
+                        target = self.sessions_by_player.get(target_player_id)
+                        if target is not None:
+                            self._set_room(target, None)
+                            self._send(target, Message("event", {"type": MSG_KICK_PLAYER, "room_id": room.room_id}))
                 else:
                     self._send(sess, Message("error", {"msg": "Permission denied"}))
 
@@ -408,7 +975,7 @@ class NetworkServer:
                     rest_time = data.get("rest_time")
                     room.set_game_config(max_rounds, round_time, rest_time)
                     self._send(sess, Message("ack", {"ok": True, "event": MSG_SET_GAME_CONFIG}))
-                    self.broadcast_room(sess.room_id, Message(MSG_ROOM_UPDATE, room.get_public_state()))
+                    self.broadcast_room_update(room)
                 else:
                     self._send(sess, Message("error", {"msg": "Permission denied"}))
 
@@ -421,16 +988,16 @@ class NetworkServer:
                 if room.owner_id == sess.player_id:
                     room.status = "playing"
                     room.round_number = 1
-                    # 选择第一个绘画者
-                    import random
-                    room.drawer_id = random.choice(list(room.players.keys()))
+                    # 随机排定绘画顺序并选出第一个绘画者
+                    room.rebuild_drawer_cycle()
+                    room.drawer_id = room.next_drawer()
                     # 选择词语
                     room.current_word = room.get_next_word()
                     room.round_start_time = time.time()
                     # 重置所有玩家分数
                     for pid in room.players:
                         room.players[pid]["score"] = 0
-                    self.broadcast_room(sess.room_id, Message(MSG_ROOM_UPDATE, room.get_public_state()))
+                    self.broadcast_room_update(room)
                     # 全局播报：游戏开始，XXX是绘画者
                     drawer_name = room.players[room.drawer_id]["name"]
                     self.broadcast_room(sess.room_id, Message("event", {
@@ -450,10 +1017,10 @@ class NetworkServer:
                 room = self.rooms[sess.room_id]
                 if room.drawer_id == sess.player_id:
                     target_player_id = str(data.get("player_id"))
-                    score = int(data.get("score", 0))
+                    score = max(-GIVE_SCORE_LIMIT, min(GIVE_SCORE_LIMIT, int(data.get("score", 0))))
                     if target_player_id in room.players:
                         room.players[target_player_id]["score"] += score
-                        self.broadcast_room(sess.room_id, Message(MSG_ROOM_UPDATE, room.get_public_state()))
+                        self.broadcast_room_update(room)
                         self.broadcast_room(sess.room_id, Message("event", {
                             "type": MSG_GIVE_SCORE,
                             "player_id": target_player_id,
@@ -476,19 +1043,14 @@ class NetworkServer:
                         self.broadcast_room(sess.room_id, Message(MSG_GAME_RESULT, {"ranking": result}))
                         room.status = "waiting"
                         room.round_number = 0
-                        self.broadcast_room(sess.room_id, Message(MSG_ROOM_UPDATE, room.get_public_state()))
+                        self.broadcast_room_update(room)
                     else:
-                        # 继续下一轮
-                        import random
-                        # 轮换绘画者
-                        player_ids = list(room.players.keys())
-                        current_index = player_ids.index(room.drawer_id) if room.drawer_id in player_ids else -1
-                        next_index = (current_index + 1) % len(player_ids)
-                        room.drawer_id = player_ids[next_index]
+                        # 继续下一轮：轮换绘画者
+                        room.drawer_id = room.next_drawer()
                         room.current_word = room.get_next_word()
                         room.round_start_time = time.time()
 
-                        self.broadcast_room(sess.room_id, Message(MSG_ROOM_UPDATE, room.get_public_state()))
+                        self.broadcast_room_update(room)
                         drawer_name = room.players[room.drawer_id]["name"]
                         self.broadcast_room(sess.room_id, Message("event", {
                             "type": MSG_NEXT_ROUND,
@@ -500,8 +1062,25 @@ class NetworkServer:
 
         elif t == MSG_DRAW:
             if sess.room_id:
-                payload = {"by": sess.player_id, "data": data}
-                self.broadcast_room(sess.room_id, Message("draw_sync", payload), exclude=sess)
+                if "b" in data:
+                    # 客户端一帧内的多个动作合并在一条消息里
+                    batch = data["b"]
+                    if isinstance(batch, list):
+                        for wire in batch:
+                            if isinstance(wire, list) and wire and wire[0] == _DRAW_WIRE_RUN:
+                                run = unpack_draw_run(wire)
+                                if run is not None:
+                                    self._queue_draw_run(sess, *run)
+                                continue
+                            action = unpack_draw_action(wire)
+                            if action is not None:
+                                self._queue_draw(sess, action)
+                    return
+                if "a" in data:
+                    data = unpack_draw_action(data["a"])
+                    if data is None:
+                        return
+                self._queue_draw(sess, data)
 
         elif t == MSG_CHAT:
             if sess.room_id:
@@ -512,10 +1091,10 @@ class NetworkServer:
                 if room and room.status == "playing" and room.current_word:
                     # 不是绘画者才可以猜
                     if sess.player_id != room.drawer_id:
-                        # 完全匹配：自动加分
-                        if text.strip() == room.current_word:
+                        # 忽略大小写、空白与标点后匹配：自动加分
+                        if normalize_text(text) == normalize_text(room.current_word):
                             room.players[sess.player_id]["score"] += 10
-                            self.broadcast_room(sess.room_id, Message(MSG_ROOM_UPDATE, room.get_public_state()))
+                            self.broadcast_room_update(room)
                             # 播报猜对消息
                             self.broadcast_room(sess.room_id, Message("event", {
                                 "type": "guess_correct",
@@ -535,17 +1114,40 @@ class NetworkServer:
                 self.broadcast_room(sess.room_id, Message("chat", payload))
 
     def _send(self, sess: ClientSession, msg: Message) -> None:
-        try:
-            payload = msg.to_json() + "\n"
-            sess.sock.sendall(payload.encode("utf-8"))
-        except Exception:
-            pass
+        """向单个会话发送消息。"""
+        self._send_bytes(sess, msg.to_frame(sess.codec))
+
+    @staticmethod
+    def _frame_for(sess: ClientSession, msg: Message, frames: Dict[str, bytes]) -> bytes:
+        """取该会话编码下的帧；frames 缓存本次广播已编码的结果，每种编码只编码一次。"""
+        frame = frames.get(sess.codec)
+        if frame is None:
+            frame = frames[sess.codec] = msg.to_frame(sess.codec)
+        return frame
+
+    def _send_bytes(self, sess: ClientSession, payload: bytes) -> None:
+        """将已编码的帧放入会话发送队列，由事件循环在本轮末尾批量写出。"""
+        if sess.closed:
+            return
+        sess.send_queue.append(payload)
+        sess.send_queued += len(payload)
+        self._dirty.add(sess)
+
+    def broadcast_room_update(self, room: GameRoom) -> None:
+        """向房间广播 room_update，帧来自 GameRoom 的编码缓存。"""
+        frames: Dict[str, bytes] = {}
+        for sess in self.room_members.get(room.room_id, ()):
+            frame = frames.get(sess.codec)
+            if frame is None:
+                frame = frames[sess.codec] = room.public_state_frame(sess.codec)
+            self._send_bytes(sess, frame)
 
     def broadcast_room(self, room_id: str, msg: Message, exclude: Optional[ClientSession] = None) -> None:
-        with self._lock:
-            for sess in list(self.sessions.values()):
-                if sess.room_id == room_id and sess != exclude:
-                    self._send(sess, msg)
+        # 每种编码只编码一次，同编码的接收者共享同一份字节
+        frames: Dict[str, bytes] = {}
+        for sess in self.room_members.get(room_id, ()):
+            if sess is not exclude:
+                self._send_bytes(sess, self._frame_for(sess, msg, frames))
 
 # ============== 主函数 ==============
 def main():
@@ -566,8 +1168,11 @@ def main():
     logger.info("服务器运行中，按 Ctrl+C 停止")
 
     try:
-        while True:
+        # 事件循环线程意外结束时退出进程，不再假装服务器仍在运行
+        while server._loop_thread.is_alive():
             time.sleep(1)
+        logger.error("事件循环已停止，服务器退出")
+        sys.exit(1)
     except KeyboardInterrupt:
         logger.info("\n服务器正在关闭...")
         server.stop()
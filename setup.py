@@ -15,6 +15,10 @@ setup(
         "pygame>=2.0.0",
     ],
     extras_require={
+        "speedups": [
+            "orjson>=3.9",
+            "msgpack>=1.0",
+        ],
         "dev": [
             "black==23.9.1",
             "flake8==6.1.0",
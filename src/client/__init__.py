@@ -9,7 +9,7 @@
 
 入口提示：
 - 运行 src/client/main.py 启动 Pygame 客户端
-- 与服务器通信基于行分隔 JSON（Message.to_json() + "\n"）
+- 与服务器通信基于行分隔 JSON（Message.to_bytes() + b"\n"）
 """
 
 from . import game, ui, network
@@ -81,8 +81,7 @@ class ClientNetwork:
 		with self._lock:
 			if not self._sock:
 				raise RuntimeError("not connected")
-			data = (msg.to_json() + "\n").encode("utf-8")
-			self._sock.sendall(data)
+			self._sock.sendall(msg.to_bytes() + b"\n")
 
 	def _recv_loop(self) -> None:
 		"""接收线程：按行分割并回调处理"""
@@ -110,8 +109,7 @@ class ClientNetwork:
 
 	def _handle_raw(self, raw: bytes) -> None:
 		try:
-			text = raw.decode("utf-8", errors="replace")
-			msg = Message.from_json(text)
+			msg = Message.from_json(bytes(raw))
 		except Exception:
 			return
 		# // 分发到对应处理器
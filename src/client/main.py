@@ -11,7 +11,7 @@ import math
 import uuid
 import os
 import subprocess
-from typing import Any, Callable, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 # 添加项目根目录到路径（保留以便直接运行脚本时能找到包）
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
@@ -29,6 +29,7 @@ from src.shared.constants import (
     MSG_CHAT, MSG_NEXT_ROUND, MSG_GIVE_SCORE, MSG_GAME_RESULT,
     DEFAULT_HOST, DEFAULT_PORT
 )
+from src.shared.protocols import apply_draw_delta, unpack_draw_points
 from src.client.network import NetworkClient
 from src.client.ui.button import Button
 from src.client.ui.buttons_config import BUTTONS_CONFIG
@@ -83,6 +84,8 @@ APP_STATE: Dict[str, Any] = {
     "_saved_chat_scroll": None,
     # 创建房间加载界面使用的实时日志
     "creating_logs": [],
+    # 积分榜排序缓存：(players 字典, 排序结果)，见 sorted_players_by_score
+    "_players_rank": (None, []),
 }
 
 
@@ -141,6 +144,19 @@ def get_network_client() -> NetworkClient:
     return net
 
 
+def sorted_players_by_score(players: Dict[str, Dict[str, Any]]) -> List[Tuple[str, Dict[str, Any]]]:
+    """按分数降序排列玩家，供每帧绘制积分榜使用。
+
+    players 随每次房间状态更新整体替换，因此按对象身份缓存排序结果，
+    状态不变的帧直接复用，不再每帧重新排序。
+    """
+    cached_players, ranked = APP_STATE["_players_rank"]
+    if cached_players is not players:
+        ranked = sorted(players.items(), key=lambda x: x[1].get("score", 0), reverse=True)
+        APP_STATE["_players_rank"] = (players, ranked)
+    return ranked
+
+
 def detect_local_ip() -> str:
     """检测本机可用于局域网连接的 IPv4 地址。
 
@@ -525,7 +541,7 @@ def build_play_ui(screen_size: tuple) -> Dict[str, Any]:
     # 尝试从保存的消息恢复（窗口大小改变时）
     saved_messages = APP_STATE.get("_saved_chat_messages")
     if saved_messages:
-        chat.messages = saved_messages
+        chat.messages.extend(saved_messages)
         # 恢复滚动状态
         saved_scroll = APP_STATE.get("_saved_chat_scroll", 0)
         chat.scroll_offset = saved_scroll
@@ -538,7 +554,7 @@ def build_play_ui(screen_size: tuple) -> Dict[str, Any]:
         if old_ui and isinstance(old_ui, dict) and "chat" in old_ui:
             old_chat = old_ui["chat"]
             if hasattr(old_chat, "messages") and old_chat.messages:
-                chat.messages = old_chat.messages[:]
+                chat.messages.extend(old_chat.messages)
                 if hasattr(old_chat, "scroll_offset"):
                     chat.scroll_offset = old_chat.scroll_offset
 
@@ -1280,22 +1296,52 @@ def process_network_messages(ui: Optional[Dict[str, Any]]) -> None:
                 ui["chat"].add_message(name, text)
             except Exception:
                 pass
-        elif msg.type == "draw_sync":
-            # 处理远程绘画同步
+        elif msg.type in ("draw_sync", "draw_sync_batch"):
+            # 处理远程绘画同步（服务器按帧合并为 draw_sync_batch，旧服务器逐条发送 draw_sync）
             # 若 UI 尚未初始化（例如刚切换到 play 时），直接丢弃该帧以避免崩溃
             if not ui:
                 continue
-            by_id = data.get("by")
-            if by_id and self_id and str(by_id) == str(self_id):
-                # 跳过自己的绘画动作（已在本地显示）
+            canvas = ui.get("canvas")
+            if not canvas:
                 continue
-            draw_data = data.get("data", {})
-            try:
-                canvas = ui.get("canvas")
-                if canvas:
-                    canvas.apply_remote_action(draw_data)
-            except Exception:
-                pass
+            strokes = data.get("strokes", []) if msg.type == "draw_sync_batch" else [data]
+            # 每个玩家上一笔的完整动作，用于还原服务器下发的增量 "d"
+            draw_cache = APP_STATE.setdefault("draw_cache", {})
+            for stroke in strokes:
+                if not isinstance(stroke, dict):
+                    continue
+                by_id = stroke.get("by")
+                points = None
+                # 解码与绘制都放在异常保护内：单条格式错误的笔画不能中断消息处理
+                try:
+                    if "xy" in stroke:
+                        # 合并后的连续折线：末段作为该玩家下一次增量的基准
+                        points = unpack_draw_points(stroke["xy"])
+                        if len(points) < 2:
+                            continue
+                        action = {
+                            "kind": "line",
+                            "from": list(points[-2]),
+                            "to": list(points[-1]),
+                            "color": stroke.get("c"),
+                            "size": stroke.get("s"),
+                            "mode": stroke.get("m"),
+                        }
+                        draw_cache[by_id] = action
+                    elif "d" in stroke:
+                        action = apply_draw_delta(draw_cache.get(by_id, {}), stroke["d"])
+                        draw_cache[by_id] = {} if action.get("kind") == "clear" else action
+                    else:
+                        action = stroke.get("data", {})
+                    if by_id and self_id and str(by_id) == str(self_id):
+                        # 跳过自己的绘画动作（已在本地显示）
+                        continue
+                    if points is not None:
+                        canvas.apply_remote_polyline(points, action["color"], action["size"])
+                    else:
+                        canvas.apply_remote_action(action)
+                except Exception:
+                    pass
         elif msg.type == "room_state":
             if not ui:
                 continue
@@ -1499,7 +1545,7 @@ def main() -> None:
                     if ui and isinstance(ui, dict) and "chat" in ui:
                         chat = ui["chat"]
                         if hasattr(chat, "messages"):
-                            APP_STATE["_saved_chat_messages"] = chat.messages[:]
+                            APP_STATE["_saved_chat_messages"] = list(chat.messages)
                             if hasattr(chat, "scroll_offset"):
                                 APP_STATE["_saved_chat_scroll"] = chat.scroll_offset
                 else:
@@ -1966,7 +2012,7 @@ def main() -> None:
                     screen.blit(title, (score_x + 40, score_y))
 
                     # 排序玩家
-                    sorted_players = sorted(players.items(), key=lambda x: x[1].get("score", 0), reverse=True)
+                    sorted_players = sorted_players_by_score(players)
 
                     # 当前绘制起始 y 位置（支持根据内容高度动态累积）
                     row_y = score_y + 40
@@ -2182,7 +2228,7 @@ def main() -> None:
                     start_y = 150
                     idx = 0
                     # 积分榜始终在前：按分数降序显示
-                    sorted_players = sorted(players.items(), key=lambda x: x[1].get("score", 0), reverse=True)
+                    sorted_players = sorted_players_by_score(players)
                     for pid, pdata in sorted_players:
                         name = pdata.get("name", "Unknown")
                         score = pdata.get("score", 0)
@@ -2501,6 +2547,11 @@ def main() -> None:
                 pygame.draw.rect(screen, n["color"], bg_rect, 2, border_radius=8)
                 screen.blit(txt_surf, (tx, ty))
 
+            # 本帧产生的绘画动作合并为一条消息发出
+            net = APP_STATE.get("net")
+            if net:
+                net.flush_draws()
+
             pygame.display.flip()
             clock.tick(60)
 
@@ -26,7 +26,16 @@ from src.shared.constants import (
     MSG_GIVE_SCORE,
     MSG_NEXT_ROUND
 )
-from src.shared.protocols import Message
+from src.shared.protocols import (
+    CODEC_JSON,
+    CODEC_MSGPACK,
+    FRAME_HEADER_SIZE,
+    DRAW_WIRE_RUN,
+    Message,
+    msgpack,
+    pack_draw_action,
+    pack_draw_runs,
+)
 
 
 class NetworkClient:
@@ -39,6 +48,12 @@ class NetworkClient:
         self._recv_thread: Optional[threading.Thread] = None
         self._running = threading.Event()
         self._buf = bytearray()
+        # 服务器下行编码，连接握手（ack）中协商后切换
+        self.codec = CODEC_JSON
+        # 服务器是否接受定长位置编码的绘画动作（同样由 ack 告知）
+        self.draw_wire = False
+        # 本帧内已编码、尚未发出的绘画动作，由 flush_draws 合并为一条消息
+        self._draw_out: List[List[int]] = []
         self.events: SimpleQueue[Message] = SimpleQueue()
         self.player_id: Optional[str] = None
         self.player_name: Optional[str] = None
@@ -54,8 +69,14 @@ class NetworkClient:
             return True
         self.player_id = player_id or str(uuid.uuid4())
         self.player_name = player_name or "玩家"
+        self.codec = CODEC_JSON
+        self.draw_wire = False
+        self._draw_out = []
+        self._buf.clear()
         try:
             self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            # 绘画同步是高频小包，关闭 Nagle 算法以降低延迟
+            self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
             # 设置连接超时
             self.sock.settimeout(5.0)
             self.sock.connect((self.host, self.port))
@@ -65,7 +86,10 @@ class NetworkClient:
             self._recv_thread = threading.Thread(target=self._recv_loop, daemon=True)
             self._recv_thread.start()
             # 注册
-            self._send(Message(MSG_CONNECT, {"player_id": self.player_id, "name": self.player_name}))
+            hello = {"player_id": self.player_id, "name": self.player_name}
+            if msgpack is not None:
+                hello["codecs"] = [CODEC_MSGPACK]
+            self._send(Message(MSG_CONNECT, hello))
             return True
         except (OSError, socket.timeout) as e:
             print(f"连接失败: {e}")
@@ -118,7 +142,9 @@ class NetworkClient:
 
     def send_draw(self, payload: Dict[str, Any]) -> None:
         """发送绘画同步消息到服务器
-        
+
+        服务器支持定长编码时，line / paint 先缓存在本地，由 flush_draws 每帧合并发送。
+
         Args:
             payload: 绘画动作数据，包括kind、颜色、大小等
         """
@@ -126,8 +152,26 @@ class NetworkClient:
             return
         if not self.connected:
             return
+        wire = pack_draw_action(payload) if self.draw_wire else None
+        if wire is not None:
+            self._draw_out.append(wire)
+            return
+        # 不能编码的动作（如 clear）必须排在已缓存的笔画之后
+        self.flush_draws()
         self._send(Message(MSG_DRAW, payload))
 
+    def flush_draws(self) -> None:
+        """把本帧缓存的绘画动作合并为一条 MSG_DRAW 发出（主循环每帧调用一次）。"""
+        if not self._draw_out:
+            return
+        batch, self._draw_out = self._draw_out, []
+        # 连续拖动的 line 合并为 int16 折线，每点只占 4 个字节
+        batch = pack_draw_runs(batch)
+        if len(batch) == 1 and batch[0][0] != DRAW_WIRE_RUN:
+            self._send(Message(MSG_DRAW, {"a": batch[0]}))
+        else:
+            self._send(Message(MSG_DRAW, {"b": batch}))
+
     def drain_events(self) -> List[Message]:
         items: List[Message] = []
         while True:
@@ -139,23 +183,21 @@ class NetworkClient:
 
     def close(self) -> None:
         self._running.clear()
-        try:
-            if self.sock:
-                try:
-                    self.sock.shutdown(socket.SHUT_RDWR)
-                except OSError:
-                    pass
-                self.sock.close()
-        finally:
-            self.sock = None
+        # 接收线程也会调用 close，先取出局部引用避免并发置空
+        sock, self.sock = self.sock, None
+        if sock:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            sock.close()
 
     # 内部方法
     def _send(self, msg: Message) -> None:
         if not self.sock:
             return
         try:
-            payload = msg.to_json() + "\n"
-            self.sock.sendall(payload.encode("utf-8"))
+            self.sock.sendall(msg.to_bytes() + b"\n")
         except OSError:
             self.close()
 
@@ -166,24 +208,47 @@ class NetworkClient:
                 if not data:
                     break
                 self._buf.extend(data)
-                while True:
-                    try:
-                        idx = self._buf.index(ord("\n"))
-                    except ValueError:
-                        break
-                    raw = self._buf[:idx]
-                    del self._buf[: idx + 1]
-                    self._handle_raw(raw)
+                self._drain_frames()
         except OSError:
             pass
         finally:
             self.close()
 
+    def _drain_frames(self) -> None:
+        """从接收缓冲中切出所有完整的帧；握手前按换行分帧，协商后按长度前缀分帧。"""
+        buf = self._buf
+        while True:
+            if self.codec == CODEC_MSGPACK:
+                if len(buf) < FRAME_HEADER_SIZE:
+                    break
+                size = int.from_bytes(buf[:FRAME_HEADER_SIZE], "big")
+                end = FRAME_HEADER_SIZE + size
+                if len(buf) < end:
+                    break
+                body = bytes(buf[FRAME_HEADER_SIZE:end])
+                del buf[:end]
+                try:
+                    self.events.put(Message.from_msgpack(body))
+                except Exception:
+                    pass
+                continue
+            try:
+                idx = buf.index(ord("\n"))
+            except ValueError:
+                break
+            raw = buf[:idx]
+            del buf[: idx + 1]
+            self._handle_raw(raw)
+
     def _handle_raw(self, raw: bytes) -> None:
         try:
-            text = raw.decode("utf-8", errors="replace")
-            msg = Message.from_json(text)
+            msg = Message.from_json(bytes(raw))
             self.events.put(msg)
+            if msg.type == "ack" and msg.data.get("event") == MSG_CONNECT:
+                self.draw_wire = bool(msg.data.get("draw_wire"))
+                # 服务器在 ack 之后的所有下行帧都使用协商的编码
+                if msg.data.get("codec") == CODEC_MSGPACK and msgpack is not None:
+                    self.codec = CODEC_MSGPACK
         except Exception:
             # 忽略无法解析的消息
             pass
@@ -13,8 +13,10 @@
 from __future__ import annotations
 
 import time
+from collections import deque
 from dataclasses import dataclass, field
-from typing import Any, Callable, Dict, List, Optional, Tuple
+from itertools import islice
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
 
 import pygame
 
@@ -99,7 +101,8 @@ class ChatBuffer:
 
 	def __init__(self, capacity: int = 50, font: Optional[pygame.font.Font] = None):
 		self.capacity = max(10, capacity)
-		self._messages: List[Tuple[str, str, float]] = []  # (by, text, ts)
+		# // 有界队列：超出容量时自动丢弃最旧的消息
+		self._messages: Deque[Tuple[str, str, float]] = deque(maxlen=self.capacity)  # (by, text, ts)
 		if font is None:
 			# Use Chinese font by default
 			try:
@@ -112,11 +115,8 @@ class ChatBuffer:
 		self._font = font
 
 	def add(self, by: str, text: str) -> None:
-		# // 追加消息并按容量裁剪
+		# // 追加消息，容量由 deque 的 maxlen 保证
 		self._messages.append((by, text, time.time()))
-		if len(self._messages) > self.capacity:
-			overflow = len(self._messages) - self.capacity
-			del self._messages[:overflow]
 
 	def render(self, surface: pygame.Surface, rect: pygame.Rect, fg=(20, 20, 20)) -> None:
 		# // 将消息逐行绘制到指定矩形区域内
@@ -124,7 +124,7 @@ class ChatBuffer:
 		line_h = self._font.get_linesize() + 4
 		max_lines = max(1, rect.height // line_h)
 		# // 只渲染末尾若干行
-		for by, text, _ in self._messages[-max_lines:]:
+		for by, text, _ in islice(self._messages, max(0, len(self._messages) - max_lines), None):
 			msg = f"{by}: {text}"
 			surf = self._font.render(msg, True, fg)
 			surface.blit(surf, (x, y))
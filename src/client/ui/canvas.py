@@ -1,5 +1,5 @@
 import pygame
-from typing import Tuple, Optional, Callable, Dict, Any
+from typing import Tuple, Optional, Callable, Dict, Any, List
 
 
 class Canvas:
@@ -221,4 +221,15 @@ class Canvas:
                 pygame.draw.line(self.surface, color, pos_from, pos_to, size * 2)
         elif kind == "clear":
             bg_color = action.get("bg_color", self.bg_color)
-            self.surface.fill(bg_color)
\ No newline at end of file
+            self.surface.fill(bg_color)
+
+    def apply_remote_polyline(self, points: List[Tuple[int, int]], color: Tuple[int, int, int], size: int) -> None:
+        """应用远程的一整段连续折线（服务器合并的多个 line 动作）
+
+        Args:
+            points: 折线上的点（画布本地坐标），至少两个
+            color: RGB颜色值
+            size: 笔的大小（与 line 动作相同，线宽为 size * 2）
+        """
+        if len(points) >= 2:
+            pygame.draw.lines(self.surface, color, False, points, size * 2)
\ No newline at end of file
@@ -1,5 +1,11 @@
 import pygame
-from typing import List, Tuple, Optional
+from collections import OrderedDict, deque
+from typing import Deque, List, Tuple, Optional
+
+# 保留的历史消息条数上限
+MAX_MESSAGES = 200
+# 已渲染消息 Surface 缓存的容量（略大于历史上限，避免滚动时反复淘汰）
+SURFACE_CACHE_SIZE = 256
 
 
 class ChatPanel:
@@ -38,8 +44,8 @@ class ChatPanel:
                 # 最后的备选方案
                 self.font = pygame.font.SysFont(None, font_size)
 
-        # 消息列表：每个消息是 (用户名, 文本) 元组
-        self.messages: List[Tuple[str, str]] = []  # (user, text)
+        # 消息队列：每个消息是 (用户名, 文本) 元组；超出上限时自动丢弃最旧的一条
+        self.messages: Deque[Tuple[str, str]] = deque(maxlen=MAX_MESSAGES)  # (user, text)
         
         # 滚动参数
         self.scroll_offset = 0  # 滚动偏移量（像素）
@@ -49,6 +55,10 @@ class ChatPanel:
         self.content_margin = 8
         self.content_width = rect.width - 2 * self.content_margin - 20  # 留20像素给滚动条
 
+        # 已渲染消息缓存：(用户名, 文本) -> 换行后每一行的文字 Surface
+        # 文字只在消息首次出现时渲染一次，之后每帧直接 blit
+        self._surf_cache: "OrderedDict[Tuple[str, str], List[pygame.Surface]]" = OrderedDict()
+
         # 颜色定义
         self.bg_color = (250, 250, 250)      # 浅灰色背景
         self.border_color = (200, 200, 200)  # 灰色边框
@@ -62,7 +72,11 @@ class ChatPanel:
         """
         self.rect = rect
         # 重新计算内容宽度
-        self.content_width = rect.width - 2 * self.content_margin - 20
+        content_width = rect.width - 2 * self.content_margin - 20
+        if content_width != self.content_width:
+            # 宽度变化后换行结果不同，需要重新渲染
+            self._surf_cache.clear()
+        self.content_width = content_width
         # 重新计算滚动位置（确保不会超出范围）
         self._scroll_to_bottom()
 
@@ -73,10 +87,10 @@ class ChatPanel:
             user: 发送者名字（如 "你", "对方", "系统"）
             text: 消息内容
         """
-        self.messages.append((user, text))  # 添加消息到列表末尾
-        # 限制历史消息数量不超过 200 条（防止内存溢出）
-        if len(self.messages) > 200:
-            self.messages = self.messages[-200:]
+        # 添加消息到队尾；deque 的 maxlen 保证历史不超过 MAX_MESSAGES 条
+        self.messages.append((user, text))
+        # 新消息到达时立即渲染并缓存
+        self._render_message(user, text)
         # 新消息到达时，自动滚动到底部
         self._scroll_to_bottom()
 
@@ -126,13 +140,33 @@ class ChatPanel:
         
         return lines if lines else [""]
 
+    def _render_message(self, user: str, text: str) -> List[pygame.Surface]:
+        """返回一条消息换行后逐行渲染的 Surface，命中缓存时不再渲染
+
+        Args:
+            user: 发送者名字
+            text: 消息内容
+
+        Returns:
+            每一行文字对应的 Surface 列表
+        """
+        key = (user, text)
+        surfs = self._surf_cache.get(key)
+        if surfs is not None:
+            self._surf_cache.move_to_end(key)
+            return surfs
+        wrapped_lines = self._wrap_text(f"{user}: {text}", self.content_width)
+        surfs = [self.font.render(line, True, (40, 40, 40)) for line in wrapped_lines]
+        self._surf_cache[key] = surfs
+        if len(self._surf_cache) > SURFACE_CACHE_SIZE:
+            self._surf_cache.popitem(last=False)
+        return surfs
+
     def _get_total_height(self) -> int:
         """计算所有消息的总高度"""
         total_height = 0
         for user, text in self.messages:
-            line = f"{user}: {text}"
-            wrapped_lines = self._wrap_text(line, self.content_width)
-            total_height += len(wrapped_lines) * self.line_height
+            total_height += len(self._render_message(user, text)) * self.line_height
         return total_height
 
     def _scroll_to_bottom(self) -> None:
@@ -187,12 +221,7 @@ class ChatPanel:
         bubble_pad_y = 4
 
         for msg_idx, (user, text) in enumerate(self.messages):
-            line = f"{user}: {text}"
-            wrapped_lines = self._wrap_text(line, self.content_width)
-
-            for line_idx, wrapped_line in enumerate(wrapped_lines):
-                surf = self.font.render(wrapped_line, True, (40, 40, 40))
-                
+            for surf in self._render_message(user, text):
                 # 只绘制在可见区域内的行
                 if y + surf.get_height() >= self.rect.y and y <= self.rect.y + self.rect.height:
                     # 气泡背景
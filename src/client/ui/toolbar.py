@@ -45,6 +45,7 @@ class Toolbar:
         # 当前选中的颜色和笔刷索引（用于高亮显示）
         self.selected_color_index: Optional[int] = None
         self.selected_size_index: Optional[int] = None
+        self._recompute_layout()
 
     def set_selected_color(self, color: Tuple[int, int, int]) -> None:
         """根据颜色值设置选中的颜色索引。"""
@@ -68,6 +69,108 @@ class Toolbar:
             else:
                 self.selected_size_index = None
 
+    def _recompute_layout(self) -> None:
+        """按当前 rect 预先计算所有可点击区域，并把静态部分绘制到缓存 Surface。
+
+        布局只在初始化与 rect 变化时计算一次；每帧绘制只需 blit 静态层并叠加高亮，
+        点击检测直接遍历预先计算好的区域列表。
+        """
+        pad = 8
+        swatch_size = 28
+        width, height = self.rect.width, self.rect.height
+        title = self.font.render("工具栏", True, (60, 60, 60))
+        brush_label = self.font.render("笔刷大小", True, (60, 60, 80))
+        lbl_clear = self.font.render("清空", True, (255, 255, 255))
+
+        # 可点击区域：(画布内坐标 Rect, 类型, 回调)，类型为 color / brush / clear / erase
+        layout: List[Tuple[pygame.Rect, str, Callable[[], None]]] = []
+
+        # 颜色调色板
+        cols_per_row = max(1, (width - pad * 2) // (swatch_size + 6))
+        top = pad + title.get_height() + 8
+        for idx in range(len(self.colors)):
+            row, col = divmod(idx, cols_per_row)
+            rect = pygame.Rect(pad + col * (swatch_size + 6), top + row * (swatch_size + 6), swatch_size, swatch_size)
+            layout.append((rect, "color", lambda i=idx: self._pick_color(i)))
+        rows = (len(self.colors) + cols_per_row - 1) // cols_per_row
+        brush_label_y = top + rows * (swatch_size + 6) + 2
+
+        # 画笔大小
+        by = brush_label_y + 4 + brush_label.get_height()
+        for i in range(len(self.sizes)):
+            brect = pygame.Rect(pad + i * (swatch_size + 10), by, swatch_size, swatch_size)
+            layout.append((brect, "brush", lambda i=i: self._pick_size(i)))
+
+        # 底部按钮：清空与橡皮
+        btn_h = 36
+        clear_rect = pygame.Rect(pad, height - btn_h - pad, (width - pad * 3) // 2, btn_h)
+        erase_rect = pygame.Rect(clear_rect.right + pad, clear_rect.y, clear_rect.width, btn_h)
+        layout.append((clear_rect, "clear", self._press_clear))
+        layout.append((erase_rect, "erase", self._toggle_mode))
+
+        # 静态层：背景、标题、色块、笔刷按钮、按钮底色与“清空”文字
+        static = pygame.Surface((width, height)).convert()
+        local = static.get_rect()
+        pygame.draw.rect(static, (240, 240, 245), local)  # 浅蓝白色背景
+        pygame.draw.rect(static, (180, 190, 220), local, 3)  # 更深的蓝色边框
+        static.blit(title, (pad, pad))
+        for idx, (rect, _, _) in enumerate(r for r in layout if r[1] == "color"):
+            # 阴影
+            pygame.draw.rect(static, (200, 200, 200), rect.move(2, 2), border_radius=3)
+            # 颜色块
+            pygame.draw.rect(static, self.colors[idx], rect, border_radius=4)
+            pygame.draw.rect(static, (100, 100, 100), rect, 2, border_radius=4)
+        static.blit(brush_label, (pad, brush_label_y))
+        for i, (brect, _, _) in enumerate(r for r in layout if r[1] == "brush"):
+            pygame.draw.rect(static, (230, 240, 255), brect, border_radius=4)
+            pygame.draw.rect(static, (150, 170, 220), brect, 2, border_radius=4)
+            # 预览圆圈 - 显示实际大小
+            pygame.draw.circle(static, (80, 120, 200), brect.center, max(2, self.sizes[i] // 2))
+        # 清空按钮 - 红色
+        pygame.draw.rect(static, (240, 100, 100), clear_rect, border_radius=5)
+        pygame.draw.rect(static, (150, 50, 50), clear_rect, 2, border_radius=5)
+        # 橡皮/画笔按钮 - 绿色
+        pygame.draw.rect(static, (100, 200, 100), erase_rect, border_radius=5)
+        pygame.draw.rect(static, (50, 100, 50), erase_rect, 2, border_radius=5)
+        static.blit(lbl_clear, (clear_rect.x + (clear_rect.width - lbl_clear.get_width()) // 2, clear_rect.y + (btn_h - lbl_clear.get_height()) // 2))
+
+        self._layout = layout
+        self._color_rects = [r for r, kind, _ in layout if kind == "color"]
+        self._brush_rects = [r for r, kind, _ in layout if kind == "brush"]
+        self._erase_rect = erase_rect
+        self._static = static
+        # 橡皮按钮文字随模式切换，两种都预先渲染
+        self._mode_labels = {
+            "draw": self.font.render("橡皮", True, (255, 255, 255)),
+            "erase": self.font.render("画笔", True, (255, 255, 255)),
+        }
+        self._layout_rect = self.rect.copy()
+
+    def _ensure_layout(self) -> None:
+        if self.rect != self._layout_rect:
+            self._recompute_layout()
+
+    def _pick_color(self, idx: int) -> None:
+        # 设置选中颜色索引
+        self.selected_color_index = idx
+        if self.on_color:
+            self.on_color(self.colors[idx])
+
+    def _pick_size(self, idx: int) -> None:
+        # 设置选中笔刷索引
+        self.selected_size_index = idx
+        if self.on_brush:
+            self.on_brush(self.sizes[idx])
+
+    def _press_clear(self) -> None:
+        if self.on_clear:
+            self.on_clear()
+
+    def _toggle_mode(self) -> None:
+        self._current_mode = "erase" if self._current_mode == "draw" else "draw"
+        if self.on_mode:
+            self.on_mode(self._current_mode)
+
     def handle_event(self, event: pygame.event.Event) -> None:
         if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
             if not self.rect.collidepoint(event.pos):
@@ -80,131 +183,29 @@ class Toolbar:
                 except Exception:
                     pass
 
-            lx, ly = event.pos[0] - self.rect.x, event.pos[1] - self.rect.y
-            # 计算点击区域：顶部颜色块、居中画笔大小、底部按钮
-            # 顶部颜色区域
-            pad = 8
-            swatch_size = 28
-            title_h = 24  # 标题高度
-
-            cols_per_row = max(1, (self.rect.width - pad * 2) // (swatch_size + 6))
-            rows = (len(self.colors) + cols_per_row - 1) // cols_per_row
-            color_area_h = pad + title_h + 4 + rows * (swatch_size + 6) + pad
-
-            # 判断颜色点击
-            cx, cy = pad, pad + title_h + 4
-            idx = 0
-            for r in range(rows):
-                for c in range(cols_per_row):
-                    if idx >= len(self.colors):
-                        break
-                    rect = pygame.Rect(cx, cy, swatch_size, swatch_size)
-                    if rect.collidepoint(lx, ly):
-                        # 设置选中颜色索引
-                        self.selected_color_index = idx
-                        if self.on_color:
-                            self.on_color(self.colors[idx])
-                        return
-                    cx += swatch_size + 6
-                    idx += 1
-                cx = pad
-                cy += swatch_size + 6
-
-            # 画笔大小区域（需要计算标签高度）
-            brush_label_h = 24
-            brush_y = color_area_h + brush_label_h + 6
-            for i, size in enumerate(self.sizes):
-                bx = pad + i * (swatch_size + 10)
-                brect = pygame.Rect(bx, brush_y, swatch_size, swatch_size)
-                if brect.collidepoint(lx, ly):
-                    # 设置选中笔刷索引
-                    self.selected_size_index = i
-                    if self.on_brush:
-                        self.on_brush(size)
-                    return
-
-            # 底部按钮区域：清空与橡皮
-            btn_h = 36
-            clear_rect = pygame.Rect(pad, self.rect.height - btn_h - pad, (self.rect.width - pad * 3) // 2, btn_h)
-            erase_rect = pygame.Rect(clear_rect.right + pad, clear_rect.y, clear_rect.width, btn_h)
-            if clear_rect.collidepoint(lx, ly):
-                if self.on_clear:
-                    self.on_clear()
-                return
-            if erase_rect.collidepoint(lx, ly):
-                self._current_mode = "erase" if self._current_mode == "draw" else "draw"
-                if self.on_mode:
-                    self.on_mode(self._current_mode)
-                return
+            self._ensure_layout()
+            local_pos = (event.pos[0] - self.rect.x, event.pos[1] - self.rect.y)
+            callback = next((cb for r, _, cb in self._layout if r.collidepoint(local_pos)), None)
+            if callback:
+                callback()
 
     def draw(self, screen: pygame.Surface) -> None:
-        # 背景与边框 - 使用更好看的渐变效果（通过矩形堆叠模拟）
-        pygame.draw.rect(screen, (240, 240, 245), self.rect)  # 浅蓝白色背景
-        pygame.draw.rect(screen, (180, 190, 220), self.rect, 3)  # 更深的蓝色边框
-
-        pad = 8
-        swatch_size = 28
-        # 标题
-        title = self.font.render("工具栏", True, (60, 60, 60))
-        screen.blit(title, (self.rect.x + pad, self.rect.y + pad))
-
-        # 颜色调色板 - 添加阴影效果
-        cols_per_row = max(1, (self.rect.width - pad * 2) // (swatch_size + 6))
-        cx = self.rect.x + pad
-        cy = self.rect.y + pad + title.get_height() + 8
-        idx = 0
-        for _ in range((len(self.colors) + cols_per_row - 1) // cols_per_row):
-            for _ in range(cols_per_row):
-                if idx >= len(self.colors):
-                    break
-                rect = pygame.Rect(cx, cy, swatch_size, swatch_size)
-                # 阴影
-                shadow_rect = pygame.Rect(cx + 2, cy + 2, swatch_size, swatch_size)
-                pygame.draw.rect(screen, (200, 200, 200), shadow_rect, border_radius=3)
-                # 颜色块
-                pygame.draw.rect(screen, self.colors[idx], rect, border_radius=4)
-                pygame.draw.rect(screen, (100, 100, 100), rect, 2, border_radius=4)
-                # 高亮当前选中的颜色
-                if self.selected_color_index == idx:
-                    pygame.draw.rect(screen, (50, 120, 220), rect, 3)
-                    inner = rect.inflate(-6, -6)
-                    pygame.draw.rect(screen, (255, 255, 255), inner, 2)
-                cx += swatch_size + 6
-                idx += 1
-            cx = self.rect.x + pad
-            cy += swatch_size + 6
-
-        # 画笔大小 - 改进样式
-        brush_label = self.font.render("笔刷大小", True, (60, 60, 80))
-        screen.blit(brush_label, (self.rect.x + pad, cy + 2))
-        by = cy + 6 + brush_label.get_height()
-        for i, size in enumerate(self.sizes):
-            brect = pygame.Rect(self.rect.x + pad + i * (swatch_size + 10), by, swatch_size, swatch_size)
-            # 背景 - 浅蓝色
-            pygame.draw.rect(screen, (230, 240, 255), brect, border_radius=4)
-            pygame.draw.rect(screen, (150, 170, 220), brect, 2, border_radius=4)
-            # 高亮当前选中的笔刷大小
-            if self.selected_size_index == i:
-                pygame.draw.rect(screen, (50, 120, 220), brect, 3, border_radius=4)
-                inner_b = brect.inflate(-6, -6)
-                pygame.draw.rect(screen, (255, 255, 255), inner_b, 2, border_radius=4)
-            # 预览圆圈 - 显示实际大小
-            pygame.draw.circle(screen, (80, 120, 200), brect.center, max(2, size // 2))
-
-        # 底部按钮 - 改进样式
-        btn_h = 36
-        clear_rect = pygame.Rect(self.rect.x + pad, self.rect.bottom - btn_h - pad, (self.rect.width - pad * 3) // 2, btn_h)
-        erase_rect = pygame.Rect(clear_rect.right + pad, clear_rect.y, clear_rect.width, btn_h)
-
-        # 清空按钮 - 红色
-        pygame.draw.rect(screen, (240, 100, 100), clear_rect, border_radius=5)
-        pygame.draw.rect(screen, (150, 50, 50), clear_rect, 2, border_radius=5)
-
-        # 橡皮/画笔按钮 - 绿色
-        pygame.draw.rect(screen, (100, 200, 100), erase_rect, border_radius=5)
-        pygame.draw.rect(screen, (50, 100, 50), erase_rect, 2, border_radius=5)
-
-        lbl_clear = self.font.render("清空", True, (255, 255, 255))
-        lbl_erase = self.font.render("橡皮" if self._current_mode == "draw" else "画笔", True, (255, 255, 255))
-        screen.blit(lbl_clear, (clear_rect.x + (clear_rect.width - lbl_clear.get_width()) // 2, clear_rect.y + (btn_h - lbl_clear.get_height()) // 2))
-        screen.blit(lbl_erase, (erase_rect.x + (erase_rect.width - lbl_erase.get_width()) // 2, erase_rect.y + (btn_h - lbl_erase.get_height()) // 2))
+        self._ensure_layout()
+        ox, oy = self.rect.topleft
+        screen.blit(self._static, (ox, oy))
+
+        # 高亮当前选中的颜色
+        if self.selected_color_index is not None and self.selected_color_index < len(self._color_rects):
+            rect = self._color_rects[self.selected_color_index].move(ox, oy)
+            pygame.draw.rect(screen, (50, 120, 220), rect, 3)
+            pygame.draw.rect(screen, (255, 255, 255), rect.inflate(-6, -6), 2)
+
+        # 高亮当前选中的笔刷大小
+        if self.selected_size_index is not None and self.selected_size_index < len(self._brush_rects):
+            brect = self._brush_rects[self.selected_size_index].move(ox, oy)
+            pygame.draw.rect(screen, (50, 120, 220), brect, 3, border_radius=4)
+            pygame.draw.rect(screen, (255, 255, 255), brect.inflate(-6, -6), 2, border_radius=4)
+
+        erase_rect = self._erase_rect.move(ox, oy)
+        lbl_erase = self._mode_labels[self._current_mode]
+        screen.blit(lbl_erase, (erase_rect.x + (erase_rect.width - lbl_erase.get_width()) // 2, erase_rect.y + (erase_rect.height - lbl_erase.get_height()) // 2))
@@ -1,38 +1,56 @@
 import random
 import time
 import logging
-from typing import Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
+# 倒计时在每次状态广播时都会计算，绑定为模块级名字省去属性查找
+_now = time.time
+
+# 猜词比较时忽略的空白（含全角空格）与中英文标点，预先构建删除表，str.translate 一次遍历完成
+# 与 server-deploy/server.py 的 _DEL_CHARS 保持一致，两个服务器的猜词判定相同
+_DEL_CHARS = " \t\n\r\v\f\u3000,.;:!?'\"-_/\\()[]{}，。；：！？（）【】"
+_TRANS = str.maketrans("", "", _DEL_CHARS)
+
 
 class GameRoom:
     """
     游戏房间类，管理玩家、游戏状态和回合逻辑。
     """
 
-    def __init__(self, room_id: str):
+    def __init__(self, room_id: str) -> None:
         self.room_id = room_id
-        self.players: Dict[str, Dict[str, any]] = {}  # player_id -> {name, score, is_drawer}
+        self.players: Dict[str, Dict[str, Any]] = {}  # player_id -> {name, score, is_drawer}
         self.owner_id: Optional[str] = None
         # waiting: 未开始/大厅
         # playing: 正在绘画回合
         # resting: 回合间休息
         # ended: 游戏结束
-        self.status = "waiting"  # waiting, playing, resting, ended
+        self.status: str = "waiting"  # waiting, playing, resting, ended
         self.current_word: Optional[str] = None
+        self._normalized_word: Optional[str] = None  # current_word 的归一化形式，选词时计算
+        self._word_mask: Optional[str] = None  # 与 current_word 等长的 '*'，选词时计算
         self.drawer_id: Optional[str] = None
         self.round_number = 0
         self.max_rounds = 5
-        self.round_start_time = 0
+        self.round_start_time: float = 0.0
         self.round_duration = 60  # seconds
         self.rest_time = 10  # 轮与轮之间休息时间（秒）
-        self.rest_start_time = 0
+        self.rest_start_time: float = 0.0
         # 设置：绘画者退出时是否立刻终止本轮进入休息
         self.end_round_on_drawer_leave = True
         self.drawer_order: List[str] = []  # 随机生成的绘画顺序（player_id列表）
         self.current_drawer_index = 0  # 当前绘者在顺序中的索引
 
+    @staticmethod
+    def normalize(text: Optional[str]) -> str:
+        """猜词归一化：转小写并去掉空白与标点。
+
+        调用方已算出归一化结果时可直接传给 submit_guess，避免重复计算。
+        """
+        return (text or "").lower().translate(_TRANS)
+
     def add_player(self, player_id: str, player_name: str) -> bool:
         """添加玩家到房间"""
         if player_id in self.players:
@@ -49,7 +67,7 @@ class GameRoom:
         }
         return True
 
-    def remove_player(self, player_id: str):
+    def remove_player(self, player_id: str) -> None:
         """从房间移除玩家"""
         if player_id in self.players:
             del self.players[player_id]
@@ -74,42 +92,44 @@ class GameRoom:
                 # 房间空了，重置为等待状态
                 self.status = "waiting"
                 self.current_word = None
+                self._normalized_word = None
+                self._word_mask = None
                 self.drawer_id = None
                 self.round_number = 0
                 self.drawer_order = []
                 self.current_drawer_index = 0
-                self.round_start_time = 0
-                self.rest_start_time = 0
+                self.round_start_time = 0.0
+                self.rest_start_time = 0.0
 
-    def get_time_left(self) -> int:
+    def get_time_left(self, now: Optional[float] = None) -> int:
         """返回当前阶段剩余时间（秒）。
 
         - playing: round_duration 倒计时
         - resting: rest_time 倒计时
         - 其他: 0
+
+        Args:
+            now: 当前时间戳；同一次广播内多处计算时由调用方传入同一个值
         """
-        now = time.time()
+        if now is None:
+            now = _now()
         if self.status == "playing" and self.round_start_time:
-            try:
-                elapsed = max(0.0, now - float(self.round_start_time))
-            except Exception:
-                elapsed = 0.0
+            elapsed = max(0.0, now - self.round_start_time)
             return max(0, int(self.round_duration - elapsed))
         if self.status == "resting" and self.rest_start_time:
-            try:
-                elapsed = max(0.0, now - float(self.rest_start_time))
-            except Exception:
-                elapsed = 0.0
+            elapsed = max(0.0, now - self.rest_start_time)
             return max(0, int(self.rest_time - elapsed))
         return 0
 
     def start_rest(self) -> None:
         """进入回合间休息阶段。"""
         self.status = "resting"
-        self.rest_start_time = time.time()
+        self.rest_start_time = _now()
         # 清空本回合数据，避免休息阶段泄露/误用
         self.current_word = None
-        self.round_start_time = 0
+        self._normalized_word = None
+        self._word_mask = None
+        self.round_start_time = 0.0
         # 休息阶段不指定绘者，避免客户端继续显示词语
         self.drawer_id = None
         for p in self.players.values():
@@ -143,13 +163,14 @@ class GameRoom:
                 return True
         return False
 
-    def get_public_state(self, for_drawer: bool = False) -> dict:
+    def get_public_state(self, for_drawer: bool = False, now: Optional[float] = None) -> Dict[str, Any]:
         """获取房间的公开状态（用于广播给所有玩家）
 
         Args:
             for_drawer: 如果为True，包含当前词语；否则隐藏词语（只有绘者看得到）
+            now: 计算倒计时用的时间戳，见 get_time_left
         """
-        time_left = self.get_time_left()
+        time_left = self.get_time_left(now)
 
         return {
             "room_id": self.room_id,
@@ -176,7 +197,7 @@ class GameRoom:
         self.round_number = 0
         self.current_drawer_index = 0
         # 记录当前回合开始时间，用于统一倒计时
-        self.round_start_time = time.time()
+        self.round_start_time = _now()
 
         # 生成随机绘画顺序（允许重复，使每个玩家都有机会绘画max_rounds次）
         player_ids = list(self.players.keys())
@@ -214,26 +235,42 @@ class GameRoom:
         # 随机选词（这里简化处理，实际应从词库加载）
         words = ["苹果", "香蕉", "电脑", "汽车", "飞机", "西瓜", "兔子", "太阳"]
         self.current_word = random.choice(words)
+        self._normalized_word = self.normalize(self.current_word)
+        self._word_mask = "*" * len(self.current_word)
         # 新一轮开始时刷新回合开始时间
-        self.round_start_time = time.time()
+        self.round_start_time = _now()
 
         # 进入新回合时，清空休息计时
-        self.rest_start_time = 0
+        self.rest_start_time = 0.0
 
         return True
 
-    def end_game(self):
+    def end_game(self) -> None:
         """结束游戏"""
         self.status = "ended"
         self.drawer_id = None
         self.current_word = None
+        self._normalized_word = None
+        self._word_mask = None
+
+    def masked_word(self) -> str:
+        """返回与当前词语等长的 '*'，用于在聊天/事件中隐藏答案；无词语时为空串。"""
+        return self._word_mask or ""
+
+    def submit_guess(self, player_id: str, guess_text: str, normalized: Optional[str] = None) -> Tuple[bool, int]:
+        """提交猜词
 
-    def submit_guess(self, player_id: str, guess_text: str) -> Tuple[bool, int]:
-        """提交猜词"""
+        Args:
+            player_id: 猜词玩家
+            guess_text: 原始猜词文本
+            normalized: guess_text 经 normalize 后的结果；为 None 时在此计算
+        """
         if self.status != "playing" or player_id == self.drawer_id:
             return False, 0
 
-        if guess_text == self.current_word:
+        if normalized is None:
+            normalized = self.normalize(guess_text)
+        if self._normalized_word and normalized == self._normalized_word:
             # 猜对了，加分
             score_gain = 10
             self.players[player_id]["score"] += score_gain
@@ -8,6 +8,7 @@ from __future__ import annotations
 
 import logging
 import socket
+import sys
 import threading
 import json
 import traceback
@@ -40,6 +41,14 @@ from src.shared.constants import (
 from src.shared.protocols import Message
 from src.server.game import GameRoom
 
+# set_game_config 的整数字段：(请求字段, GameRoom 属性, 允许的最小值, 上限)，按表逐项转换
+# 上限避免超大整数进入房间状态：orjson / msgpack 只能编码 64 位整数
+_GAME_CONFIG_FIELDS = (
+	("max_rounds", "max_rounds", 1, 100),
+	("round_time", "round_duration", 1, 3600),
+	("rest_time", "rest_time", 0, 600),
+)
+
 
 class ClientSession:
 	"""客户端会话，封装连接与玩家信息"""
@@ -214,8 +223,8 @@ class NetworkServer:
 	def _handle_raw_message(self, sess: ClientSession, raw: bytes) -> None:
 		"""原始字节消息 -> JSON -> Message 并路由"""
 		try:
-			text = raw.decode("utf-8", errors="replace")
-			msg = Message.from_json(text)
+			# 直接解析 UTF-8 字节（orjson / json 均支持），省去先解码成 str 的一次拷贝
+			msg = Message.from_json(bytes(raw))
 		except Exception:
 			# // 非法消息，忽略
 			return
@@ -229,7 +238,8 @@ class NetworkServer:
 
 		if t == MSG_CONNECT:
 			# // 注册玩家，要求 data: {player_id, name}
-			sess.player_id = str(data.get("player_id") or sess.addr[0])
+			# player_id 会作为 room.players 的键并写进每条广播，驻留后各处共享同一个对象
+			sess.player_id = sys.intern(str(data.get("player_id") or sess.addr[0]))
 			sess.player_name = str(data.get("name") or f"Player-{sess.addr[1]}")
 			self._send(sess, Message("ack", {"ok": True, "event": MSG_CONNECT}))
 
@@ -290,32 +300,18 @@ class NetworkServer:
 					room.owner_id = sess.player_id
 				if room.owner_id == sess.player_id:
 					try:
-						max_rounds = data.get("max_rounds")
-						round_time = data.get("round_time")
-						rest_time = data.get("rest_time")
-						end_on_leave = data.get("end_round_on_drawer_leave")
 						# 兼容字符串和整数类型
-						if max_rounds is not None:
-							try:
-								val = int(max_rounds)
-								if val > 0:
-									room.max_rounds = val
-							except (ValueError, TypeError):
-								pass
-						if round_time is not None:
+						for key, attr, minimum, maximum in _GAME_CONFIG_FIELDS:
+							raw = data.get(key)
+							if raw is None:
+								continue
 							try:
-								val = int(round_time)
-								if val > 0:
-									room.round_duration = val
-							except (ValueError, TypeError):
-								pass
-						if rest_time is not None:
-							try:
-								val = int(rest_time)
-								if val >= 0:
-									room.rest_time = val
-							except (ValueError, TypeError):
-								pass
+								val = int(raw)
+							except (ValueError, TypeError, OverflowError):
+								continue
+							if val >= minimum:
+								setattr(room, attr, min(val, maximum))
+						end_on_leave = data.get("end_round_on_drawer_leave")
 						if isinstance(end_on_leave, bool):
 							room.end_round_on_drawer_leave = end_on_leave
 						logger.info(f"游戏配置更新: max_rounds={room.max_rounds}, round_duration={room.round_duration}, rest_time={room.rest_time}")
@@ -462,12 +458,13 @@ class NetworkServer:
 				try:
 					if room and room.status == "playing" and room.current_word and sess.player_id:
 						if sess.player_id != room.drawer_id:
-							guess = text.strip()
-							if guess and guess == room.current_word:
-								# 聊天内容改为与答案等长的 '*'
-								masked_text = "*" * len(room.current_word)
-								ok, score = room.submit_guess(sess.player_id, room.current_word)
+							# 归一化只做一次：空猜词（只有空白/标点）直接跳过，结果交给 submit_guess 复用
+							normalized = GameRoom.normalize(text)
+							if normalized:
+								ok, score = room.submit_guess(sess.player_id, text, normalized=normalized)
 								if ok:
+									# 聊天内容改为与答案等长的 '*'（start_rest 会清空词语，需先取出）
+									masked_text = room.masked_word()
 									# 猜对后立刻进入休息阶段（服务端权威）
 									room.start_rest()
 									# 广播房间状态（分数变化 + 进入休息 + 休息倒计时）
@@ -476,7 +473,7 @@ class NetworkServer:
 										"type": "guess_correct",
 										"player_id": sess.player_id,
 										"player_name": sess.player_name,
-										"word": "*" * len(room.current_word),
+										"word": masked_text,
 										"score": score,
 									}))
 				except Exception:
@@ -496,32 +493,43 @@ class NetworkServer:
 
 	# 发送/广播
 	def _send(self, sess: ClientSession, msg: Message) -> None:
+		self._send_bytes(sess, msg.to_bytes() + b"\n")
+
+	def _send_bytes(self, sess: ClientSession, payload: bytes) -> None:
+		"""发送已编码好的一帧（含换行分隔符）。"""
 		try:
-			text = msg.to_json() + "\n"
-			sess.conn.sendall(text.encode("utf-8"))
+			sess.conn.sendall(payload)
 		except Exception:
 			self._on_disconnect(sess)
 
 	def broadcast_room(self, room_id: str, msg: Message, exclude: Optional[ClientSession] = None) -> None:
 		"""向特定房间广播消息"""
+		# 只编码一次，所有接收者共享同一份字节
+		payload = msg.to_bytes() + b"\n"
 		for s in list(self.sessions.values()):
 			if s.room_id == room_id:
 				if exclude and s is exclude:
 					continue
-				self._send(s, msg)
+				self._send_bytes(s, payload)
 
 	def broadcast_room_state(self, room_id: str) -> None:
 		"""向房间广播房间状态，但对非绘者隐藏当前词语"""
 		if room_id not in self.rooms:
 			return
 		room = self.rooms[room_id]
+		# 状态只有两种视图（绘者 / 其他人），每种最多构建并编码一次，且共用同一时间戳
+		now = time.time()
+		payloads: Dict[bool, bytes] = {}
 
 		for s in list(self.sessions.values()):
 			if s.room_id == room_id:
 				# 如果该玩家是绘者，发送包含词语的状态；否则隐藏词语
 				is_drawer = (s.player_id == room.drawer_id)
-				state = room.get_public_state(for_drawer=is_drawer)
-				self._send(s, Message(MSG_ROOM_UPDATE, state))
+				payload = payloads.get(is_drawer)
+				if payload is None:
+					state = room.get_public_state(for_drawer=is_drawer, now=now)
+					payload = payloads[is_drawer] = Message(MSG_ROOM_UPDATE, state).to_bytes() + b"\n"
+				self._send_bytes(s, payload)
 
 	def broadcast(self, msg: Message, exclude: Optional[ClientSession] = None) -> None:
 		"""向所有连接广播 (慎用)"""
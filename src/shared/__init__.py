@@ -8,7 +8,7 @@
 - protocols: 基于 JSON 的消息格式（Message 及 Connect/Draw/Chat 等派生）
 
 提示：
-- 协议层约定按行分隔的 JSON 串，网络层直接透传 Message.to_json() + "\n"
+- 协议层约定按行分隔的 JSON 串，网络层直接透传 Message.to_bytes() + b"\n"（安装 orjson 时由其编码）
 - 若新增公共工具，可在此模块下添加并在 __all__ 中显式导出
 """
 
@@ -4,8 +4,26 @@
 定义客户端和服务器之间的通信协议格式。
 """
 
+import base64
 import json
-from typing import Any, Dict
+import sys
+from array import array
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+try:
+    import orjson
+except ImportError:  # 未安装 orjson 时退回标准库 json
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # 未安装 msgpack 时只使用 JSON 行协议
+    msgpack = None
+
+# 服务器下行编码：默认 JSON（换行分隔）；连接时可协商 MessagePack（4 字节大端长度前缀）
+CODEC_JSON = "json"
+CODEC_MSGPACK = "msgpack"
+FRAME_HEADER_SIZE = 4
 
 
 class Message:
@@ -22,20 +40,185 @@ class Message:
         self.type = msg_type
         self.data = data or {}
 
+    def to_bytes(self) -> bytes:
+        """将消息编码为 UTF-8 JSON 字节串（不含换行分隔符）
+
+        安装了 orjson 时使用 orjson，否则或 orjson 无法编码时退回标准库 json。
+        """
+        obj = {"type": self.type, "data": self.data}
+        if orjson is not None:
+            try:
+                return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+            except TypeError:
+                # orjson 不支持超出 64 位的整数等值，退回标准库 json
+                pass
+        return json.dumps(obj, ensure_ascii=False).encode("utf-8")
+
     def to_json(self) -> str:
         """将消息转换为 JSON 字符串"""
-        return json.dumps({"type": self.type, "data": self.data}, ensure_ascii=False)
+        return self.to_bytes().decode("utf-8")
 
     @classmethod
-    def from_json(cls, json_str: str) -> "Message":
-        """从 JSON 字符串创建消息"""
-        obj = json.loads(json_str)
+    def from_json(cls, json_str: Union[str, bytes]) -> "Message":
+        """从 JSON 字符串或 UTF-8 字节串创建消息"""
+        obj = orjson.loads(json_str) if orjson is not None else json.loads(json_str)
+        return cls(obj["type"], obj.get("data", {}))
+
+    @classmethod
+    def from_msgpack(cls, body: bytes) -> "Message":
+        """从 MessagePack 帧体（不含长度前缀）创建消息"""
+        obj = msgpack.unpackb(body, raw=False, strict_map_key=False)
         return cls(obj["type"], obj.get("data", {}))
 
     def __repr__(self):
         return f"Message(type={self.type}, data={self.data})"
 
 
+# 绘画增量：line 的终点为 "to"，paint 的落点为 "pos"
+_DRAW_POINT_KEYS = ("from", "to", "pos")
+_DRAW_END_KEY = {"line": "to", "paint": "pos"}
+
+
+def apply_draw_delta(last: Dict[str, Any], delta: Dict[str, Any]) -> Dict[str, Any]:
+    """将服务器下发的绘画增量应用到同一玩家的上一笔动作上，还原完整动作。
+
+    Args:
+        last: 该玩家上一笔的完整动作（首次或重置后为空字典）
+        delta: draw_sync_batch 中的增量数据 ``d``
+
+    Returns:
+        完整的绘画动作字典，可直接交给 Canvas.apply_remote_action，
+        并作为下一次调用的 last 缓存
+    """
+    action = {k: v for k, v in last.items() if k not in _DRAW_POINT_KEYS}
+    action.update((k, v) for k, v in delta.items() if k not in ("dx", "dy"))
+    anchor = last.get(_DRAW_END_KEY.get(last.get("kind"), ""))
+    end_key = _DRAW_END_KEY.get(action.get("kind"))
+    if end_key and "dx" in delta and anchor:
+        action[end_key] = [anchor[0] + delta["dx"], anchor[1] + delta["dy"]]
+    if action.get("kind") == "line" and "from" not in delta and anchor:
+        # 起点即上一笔终点；动作只读不改，直接共享该坐标对象而不复制
+        action["from"] = anchor
+    return action
+
+
+def unpack_draw_points(xy: str) -> List[Tuple[int, int]]:
+    """解码 draw_sync_batch 折线笔画中的 ``xy`` 字段
+
+    ``xy`` 为 base64 编码的小端 int16 数组：先是全部 x 坐标，后接全部 y 坐标。
+
+    Returns:
+        折线上的点列表 [(x, y), ...]
+    """
+    values = array("h")
+    values.frombytes(base64.b64decode(xy))
+    if sys.byteorder == "big":
+        values.byteswap()
+    n = len(values) // 2
+    return list(zip(values[:n], values[n:]))
+
+
+# 上行绘画动作的定长位置编码：省去每个采样点重复发送的字段名
+# line:  [DRAW_WIRE_LINE, fx, fy, tx, ty, r, g, b, size, erase]
+# paint: [DRAW_WIRE_PAINT, x, y, r, g, b, size, erase]
+# run:   [DRAW_WIRE_RUN, r, g, b, size, erase, xy]，连续 line 合并成的折线，
+#        xy 格式同 unpack_draw_points
+DRAW_WIRE_LINE = 1
+DRAW_WIRE_PAINT = 2
+DRAW_WIRE_RUN = 3
+
+
+def pack_draw_action(action: Dict[str, Any]) -> Optional[List[int]]:
+    """把 line / paint 动作编码为定长整数列表；其他动作（如 clear）返回 None，按原字典发送"""
+    kind = action.get("kind")
+    color = action.get("color")
+    erase = 1 if action.get("mode") == "erase" else 0
+    try:
+        if kind == "line":
+            (fx, fy), (tx, ty) = action["from"], action["to"]
+            return [
+                DRAW_WIRE_LINE,
+                fx,
+                fy,
+                tx,
+                ty,
+                color[0],
+                color[1],
+                color[2],
+                action["size"],
+                erase,
+            ]
+        if kind == "paint":
+            x, y = action["pos"]
+            return [
+                DRAW_WIRE_PAINT,
+                x,
+                y,
+                color[0],
+                color[1],
+                color[2],
+                action["size"],
+                erase,
+            ]
+    except (KeyError, TypeError, ValueError, IndexError):
+        pass
+    return None
+
+
+def _encode_points(xs: "array[int]", ys: "array[int]") -> str:
+    if sys.byteorder == "big":
+        xs, ys = array("h", xs), array("h", ys)
+        xs.byteswap()
+        ys.byteswap()
+    return base64.b64encode(xs.tobytes() + ys.tobytes()).decode("ascii")
+
+
+def _fits_int16(values: List[Any]) -> bool:
+    return all(type(v) is int and -32768 <= v <= 32767 for v in values)
+
+
+def _close_run(out: List[Any], run: Optional[List[Any]]) -> None:
+    if run is None:
+        return
+    style, first, xs, ys = run
+    out.append(
+        [DRAW_WIRE_RUN, *style, _encode_points(xs, ys)] if len(xs) > 2 else first
+    )
+
+
+def pack_draw_runs(batch: List[List[int]]) -> List[Any]:
+    """把一帧内已编码的动作中首尾相接、样式相同的 line 合并为 DRAW_WIRE_RUN
+
+    坐标以两个 int16 数组（SoA）累积，每点 4 个字节；超出 int16 范围的动作保持原样。
+    """
+    out: List[Any] = []
+    run: Optional[List[Any]] = None  # [样式, 首个动作, xs, ys]
+    for wire in batch:
+        if wire[0] == DRAW_WIRE_LINE and _fits_int16(wire[1:5]):
+            if (
+                run is not None
+                and wire[5:] == run[0]
+                and wire[1] == run[2][-1]
+                and wire[2] == run[3][-1]
+            ):
+                run[2].append(wire[3])
+                run[3].append(wire[4])
+                continue
+            _close_run(out, run)
+            run = [
+                wire[5:],
+                wire,
+                array("h", (wire[1], wire[3])),
+                array("h", (wire[2], wire[4])),
+            ]
+            continue
+        _close_run(out, run)
+        run = None
+        out.append(wire)
+    _close_run(out, run)
+    return out
+
+
 # TODO: 实现具体的消息类型
 class ConnectMessage(Message):
     """连接消息"""
@@ -0,0 +1,150 @@
+"""
+Tests for the client network framing and draw batching.
+"""
+
+import pytest
+
+from src.client.network import NetworkClient
+from src.shared.protocols import (
+    CODEC_JSON,
+    CODEC_MSGPACK,
+    DRAW_WIRE_PAINT,
+    DRAW_WIRE_RUN,
+    FRAME_HEADER_SIZE,
+    Message,
+    msgpack,
+    unpack_draw_points,
+)
+
+needs_msgpack = pytest.mark.skipif(msgpack is None, reason="msgpack not installed")
+
+
+def _events(client):
+    out = []
+    while not client.events.empty():
+        out.append(client.events.get_nowait())
+    return out
+
+
+def _msgpack_frame(msg_type, data):
+    body = msgpack.packb({"type": msg_type, "data": data}, use_bin_type=True)
+    return len(body).to_bytes(FRAME_HEADER_SIZE, "big") + body
+
+
+@needs_msgpack
+def test_ack_line_and_msgpack_frames_in_one_buffer():
+    """Frames after the connect ack are length-prefixed, even in the same read."""
+    client = NetworkClient()
+    ack = b'{"type": "ack", "data": {"event": "connect", "codec": "msgpack"}}\n'
+    client._buf += (
+        ack
+        + _msgpack_frame("chat", {"text": "hi"})
+        + _msgpack_frame("rooms_update", {"rooms": []})
+    )
+
+    client._drain_frames()
+
+    assert [m.type for m in _events(client)] == ["ack", "chat", "rooms_update"]
+    assert client.codec == CODEC_MSGPACK
+    assert not client._buf
+
+
+@needs_msgpack
+@pytest.mark.parametrize("cut", [2, FRAME_HEADER_SIZE + 3])
+def test_partial_msgpack_frame_waits_for_more_bytes(cut):
+    """A split header or body is kept until the rest of the frame arrives."""
+    client = NetworkClient()
+    client.codec = CODEC_MSGPACK
+    frame = _msgpack_frame("chat", {"text": "你好", "by": "p1"})
+
+    client._buf += frame[:cut]
+    client._drain_frames()
+    assert _events(client) == []
+    assert bytes(client._buf) == frame[:cut]
+
+    client._buf += frame[cut:]
+    client._drain_frames()
+    (msg,) = _events(client)
+    assert (msg.type, msg.data) == ("chat", {"text": "你好", "by": "p1"})
+    assert not client._buf
+
+
+def test_json_lines_without_codec_ack_stay_line_framed():
+    """Without a msgpack ack the client keeps newline framing."""
+    client = NetworkClient()
+    client._buf += b'{"type": "ack", "data": {"event": "connect"}}\n{"type": "chat"'
+
+    client._drain_frames()
+
+    assert [m.type for m in _events(client)] == ["ack"]
+    assert client.codec == CODEC_JSON
+    assert bytes(client._buf) == b'{"type": "chat"'
+
+
+class _RecordingSock:
+    def __init__(self):
+        self.lines = []
+
+    def sendall(self, data):
+        self.lines.extend(data.splitlines())
+
+
+def _drawing_client():
+    client = NetworkClient()
+    client.sock = _RecordingSock()
+    client._running.set()
+    client.draw_wire = True
+    return client
+
+
+def _sent(client):
+    return [Message.from_json(line) for line in client.sock.lines]
+
+
+def test_flush_draws_sends_buffered_actions_as_one_batch():
+    """Buffered line/paint actions go out as a single MSG_DRAW on flush_draws()."""
+    client = _drawing_client()
+    style = {"color": (0, 0, 0), "size": 5, "mode": "draw"}
+    for i in range(3):
+        client.send_draw(
+            {"kind": "line", "from": (i, i), "to": (i + 1, i + 1), **style}
+        )
+    client.send_draw({"kind": "paint", "pos": (9, 9), **style})
+    assert client.sock.lines == []
+
+    client.flush_draws()
+
+    (msg,) = _sent(client)
+    run, paint = msg.data["b"]
+    assert run[:6] == [DRAW_WIRE_RUN, 0, 0, 0, 5, 0]
+    assert unpack_draw_points(run[6]) == [(0, 0), (1, 1), (2, 2), (3, 3)]
+    assert paint == [DRAW_WIRE_PAINT, 9, 9, 0, 0, 0, 5, 0]
+    assert client._draw_out == []
+
+
+def test_flush_draws_with_empty_buffer_sends_nothing():
+    """No buffered actions means no message; a lone action goes out as "a"."""
+    client = _drawing_client()
+
+    client.flush_draws()
+    assert client.sock.lines == []
+
+    paint = {"kind": "paint", "pos": (1, 2), "color": (3, 4, 5), "size": 6}
+    client.send_draw(paint)
+    client.flush_draws()
+    client.flush_draws()
+
+    (msg,) = _sent(client)
+    assert msg.data == {"a": [DRAW_WIRE_PAINT, 1, 2, 3, 4, 5, 6, 0]}
+
+
+def test_unpackable_action_flushes_buffer_first():
+    """A clear is sent after the strokes buffered before it."""
+    client = _drawing_client()
+    client.send_draw({"kind": "paint", "pos": (1, 2), "color": (0, 0, 0), "size": 1})
+
+    client.send_draw({"kind": "clear", "bg_color": (255, 255, 255)})
+
+    first, second = _sent(client)
+    assert "a" in first.data
+    assert second.data == {"kind": "clear", "bg_color": [255, 255, 255]}
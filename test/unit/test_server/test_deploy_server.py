@@ -0,0 +1,564 @@
+"""
+Tests for the standalone server in server-deploy/.
+"""
+
+import base64
+import importlib.util
+import json
+import logging
+import socket
+import sys
+from array import array
+from pathlib import Path
+from unittest import mock
+
+import pytest
+
+from src.client.network import NetworkClient
+from src.server.game import GameRoom
+from src.server.game.room import _DEL_CHARS as SRC_DEL_CHARS
+from src.shared.protocols import apply_draw_delta, pack_draw_action, unpack_draw_points
+
+SERVER_PATH = Path(__file__).resolve().parents[3] / "server-deploy" / "server.py"
+
+
+@pytest.fixture(scope="module")
+def server():
+    """Load server-deploy/server.py without its import-time logging setup."""
+    root = logging.getLogger()
+    handlers, level = root.handlers[:], root.level
+    spec = importlib.util.spec_from_file_location("deploy_server", SERVER_PATH)
+    module = importlib.util.module_from_spec(spec)
+    # The module calls logging.basicConfig with a server.log FileHandler in the cwd
+    with mock.patch("logging.basicConfig"), mock.patch("logging.FileHandler"):
+        spec.loader.exec_module(module)
+    yield module
+    root.handlers[:] = handlers
+    root.setLevel(level)
+
+
+def _session_in_room(server, net, room_id="1"):
+    sess = server.ClientSession(None, ("127.0.0.1", 1))
+    sess.player_id = "p1"
+    net._set_room(sess, room_id)
+    return sess
+
+
+def test_queue_draw_drops_malformed_actions(server):
+    """Draw data without a string kind never reaches the pending batch."""
+    net = server.NetworkServer("127.0.0.1", 0)
+    sess = _session_in_room(server, net)
+
+    for data in ({"kind": ["line"]}, {"kind": None}, {}, ["line"], "line"):
+        net._queue_draw(sess, data)
+    assert net._pending_draw == {}
+
+    net._queue_draw(sess, {"kind": "clear"})
+    net._flush_draws()
+    assert net._pending_draw == {}
+
+
+def test_join_flushes_pending_draws_before_adding_member(server):
+    """Deltas encoded against the old baseline are not sent to a joining player."""
+    net = server.NetworkServer("127.0.0.1", 0)
+    drawer = server.ClientSession(None, ("127.0.0.1", 1))
+    joiner = server.ClientSession(None, ("127.0.0.1", 2))
+    for sess, name in ((drawer, "a"), (joiner, "b")):
+        net._route_message(sess, server.Message("connect", {"player_id": name}))
+    net._route_message(drawer, server.Message("create_room", {}))
+    line = {"kind": "line", "from": [0, 0], "to": [5, 5], "size": 3}
+    net._queue_draw(drawer, line)
+    joiner.send_queue.clear()
+
+    net._route_message(joiner, server.Message("join_room", {"room_id": "1"}))
+
+    assert not any(b"draw_sync_batch" in bytes(f) for f in joiner.send_queue)
+    assert drawer.last_draw == {} and joiner.last_draw == {}
+
+
+def test_guess_normalization_matches_src_server(server):
+    """Both servers strip the same whitespace and punctuation from guesses."""
+    for text in ("苹\u3000果", " Apple！\v", "a\fb-c", "（猫）"):
+        assert server.normalize_text(text) == GameRoom.normalize(text)
+    assert server._DEL_CHARS == SRC_DEL_CHARS
+
+
+def test_normalize_text_does_not_cache_long_input(server):
+    """Long chat lines are normalized directly instead of pinning cache memory."""
+    server._normalize_cached.cache_clear()
+    long_text = "A" * (server.NORMALIZE_CACHE_MAX_LEN + 1)
+
+    assert server.normalize_text(long_text) == long_text.lower()
+    assert server._normalize_cached.cache_info().currsize == 0
+    assert server.normalize_text("Cat!") == "cat"
+    assert server._normalize_cached.cache_info().currsize == 1
+
+
+def _xy(xs, ys):
+    """Pack xs then ys as little-endian int16, base64-encoded."""
+    a, b = array("h", xs), array("h", ys)
+    if sys.byteorder == "big":
+        a.byteswap()
+        b.byteswap()
+    return base64.b64encode(a.tobytes() + b.tobytes()).decode("ascii")
+
+
+def _decode_strokes(strokes):
+    """Replay a draw_sync_batch the way the client does."""
+    last, out = {}, []
+    for stroke in strokes:
+        if "xy" in stroke:
+            points = unpack_draw_points(stroke["xy"])
+            last = {"kind": "line", "from": list(points[-2]), "to": list(points[-1])}
+            last.update(color=stroke["c"], size=stroke["s"], mode=stroke["m"])
+            out.append(("run", points))
+        else:
+            last = apply_draw_delta(last, stroke["d"])
+            out.append(("action", last))
+    return out
+
+
+def test_encode_draw_delta_round_trips_through_apply(server):
+    """Server deltas rebuild the original actions on the client side."""
+    style = {"color": [1, 2, 3], "size": 4, "mode": "draw"}
+    actions = [
+        {"kind": "line", "from": [0, 0], "to": [3, 4], **style},
+        {"kind": "line", "from": [3, 4], "to": [5, 1], **style},
+        {"kind": "line", "from": [9, 9], "to": [8, 7], **style, "size": 6},
+        {"kind": "paint", "pos": [20, 30], **style},
+        {"kind": "paint", "pos": "bad", **style},
+    ]
+
+    last = {}
+    for action in actions:
+        delta = server.encode_draw_delta(last, action)
+        rebuilt = apply_draw_delta(last, delta)
+        assert rebuilt == action
+        last = rebuilt
+    assert server.encode_draw_delta(actions[0], actions[1]) == {"dx": 2, "dy": -3}
+
+
+def test_encode_draw_batch_packs_runs_and_deltas(server):
+    """Continuous lines become one xy run; single actions stay deltas."""
+    sess = server.ClientSession(None, ("127.0.0.1", 1))
+    sess.player_id = "p1"
+    style = {"color": [0, 0, 0], "size": 5, "mode": "draw"}
+    lines = [
+        {"kind": "line", "from": [i, i], "to": [i + 1, i + 1], **style}
+        for i in range(3)
+    ]
+    run = server.DrawRun(sess, lines[0])
+    assert all(run.extend(sess, line) for line in lines[1:])
+    assert not run.extend(sess, {"kind": "line", "from": [7, 7], "to": [8, 8], **style})
+    paint = {"kind": "paint", "pos": [9, 9], **style}
+
+    strokes = server.encode_draw_batch([run, (sess, paint)])
+
+    assert [s["by"] for s in strokes] == ["p1", "p1"]
+    assert _decode_strokes(strokes) == [
+        ("run", [(0, 0), (1, 1), (2, 2), (3, 3)]),
+        ("action", paint),
+    ]
+    assert sess.last_draw is paint
+
+
+def test_unpack_draw_action_inverts_client_packing(server):
+    """Positional wires decode to the client's original actions."""
+    line = {
+        "kind": "line",
+        "from": [1, 2],
+        "to": [3, 4],
+        "color": [5, 6, 7],
+        "size": 8,
+        "mode": "erase",
+    }
+    paint = {
+        "kind": "paint",
+        "pos": [1, 2],
+        "color": [5, 6, 7],
+        "size": 8,
+        "mode": "draw",
+    }
+
+    assert server.unpack_draw_action(pack_draw_action(line)) == line
+    assert server.unpack_draw_action(pack_draw_action(paint)) == paint
+
+
+def test_unpack_draw_action_rejects_malformed_wire(server):
+    """Wrong tags, lengths or element types decode to None."""
+    for wire in (
+        None,
+        [],
+        {"a": 1},
+        [1, 2, 3],
+        [9] * 10,
+        [1] * 9 + ["x"],
+        [2, 1, 2, 3, 4, 5, 6, 0.5],
+        [[1]] * 8,
+    ):
+        assert server.unpack_draw_action(wire) is None
+
+
+def test_unpack_draw_run_decodes_and_rejects(server):
+    """Runs decode to style plus int16 xs/ys; broken payloads decode to None."""
+    xy = _xy([0, 10, -20], [1, 2, 3])
+
+    style, xs, ys = server.unpack_draw_run([3, 1, 2, 3, 4, 1, xy])
+
+    assert style == {"color": [1, 2, 3], "size": 4, "mode": "erase"}
+    assert list(xs) == [0, 10, -20] and list(ys) == [1, 2, 3]
+    for wire in (
+        [3, 1, 2, 3, 4, 0],
+        [3, 1, 2, 3, 4, 0, 5],
+        [3, 1, 2, 3, "4", 0, xy],
+        [3, 1, 2, 3, 4, 0, "not base64!"],
+        [3, 1, 2, 3, 4, 0, _xy([1], [1])],
+        [3, 1, 2, 3, 4, 0, "AAAA" + "AA=="],
+    ):
+        assert server.unpack_draw_run(wire) is None
+
+
+def test_on_readable_drops_oversized_lines(server, monkeypatch):
+    """Over-long lines are skipped; a later valid line is still handled."""
+    monkeypatch.setattr(server, "MAX_MESSAGE_SIZE", 64)
+    net = server.NetworkServer("127.0.0.1", 0)
+    ours, theirs = socket.socketpair()
+    ours.setblocking(False)
+    sess = server.ClientSession(ours, ("127.0.0.1", 1))
+    try:
+        theirs.sendall(
+            b"x" * 100 + b"\n" + b'{"type": "connect", "data": {"player_id": "p1"}}\n'
+        )
+        net._on_readable(sess)
+
+        assert sess.player_id == "p1"
+        assert not sess.closed
+        assert len(sess.recv_buf) == 0
+
+        theirs.sendall(b"y" * 100)
+        net._on_readable(sess)
+
+        assert sess.closed
+    finally:
+        ours.close()
+        theirs.close()
+
+
+def test_route_draw_ignores_malformed_payloads(server):
+    """Malformed MSG_DRAW payloads neither raise nor queue anything."""
+    net = server.NetworkServer("127.0.0.1", 0)
+    sess = _session_in_room(server, net)
+    payloads = (
+        {"a": [["x"]]},
+        {"a": "line"},
+        {"b": [[["x"]], [3, 0, 0, 0, 1, 0, "!!"], "x", None]},
+        {"b": "x"},
+        {"kind": {"nested": 1}},
+    )
+
+    for data in payloads:
+        net._route_message(sess, server.Message("draw", data))
+
+    assert net._pending_draw == {}
+
+
+def _connected(server, net, name, port):
+    sess = server.ClientSession(None, ("127.0.0.1", port))
+    net._route_message(sess, server.Message("connect", {"player_id": name}))
+    return sess
+
+
+def test_oversized_ints_are_clamped_and_still_encode(server):
+    """Huge scores/config values are clamped; JSON encoding falls back past int64."""
+    net = server.NetworkServer("127.0.0.1", 0)
+    drawer = _connected(server, net, "a", 1)
+    other = _connected(server, net, "b", 2)
+    net._route_message(drawer, server.Message("create_room", {}))
+    net._route_message(other, server.Message("join_room", {"room_id": "1"}))
+    room = net.rooms["1"]
+    room.status, room.drawer_id = "playing", "a"
+
+    net._route_message(
+        drawer, server.Message("give_score", {"player_id": "b", "score": 10**23})
+    )
+    net._route_message(
+        drawer,
+        server.Message(
+            "set_game_config", {"round_time": 10**30, "max_rounds": 10**30}
+        ),
+    )
+
+    assert room.players["b"]["score"] == server.GIVE_SCORE_LIMIT
+    assert room.round_time == server.ROUND_TIME_LIMIT
+    assert room.max_rounds == server.MAX_ROUNDS_LIMIT
+    assert (
+        b"10000000000000000000000000000"
+        in server.Message("x", {"n": 10**28}).to_bytes()
+    )
+
+    net._cleanup_session(drawer)
+    net._cleanup_session(other)
+
+    assert net.rooms == {}
+    assert net._retired == [drawer, other]
+
+
+class _FakeSock:
+    """Socket stand-in whose sendmsg writes at most ``limit`` bytes per call."""
+
+    def __init__(self, limit):
+        self.limit = limit
+        self.sent = bytearray()
+
+    def sendmsg(self, chunks):
+        if not self.limit:
+            raise BlockingIOError
+        data = b"".join(bytes(c) for c in chunks)[: self.limit]
+        self.sent += data
+        return len(data)
+
+    def close(self):
+        pass
+
+
+def test_flush_keeps_unsent_tail_after_partial_write(server):
+    """A partial sendmsg keeps the rest queued and waits for EVENT_WRITE."""
+    net = server.NetworkServer("127.0.0.1", 0)
+    net._sel = mock.Mock()
+    sock = _FakeSock(limit=5)
+    sess = server.ClientSession(sock, ("127.0.0.1", 1))
+    net._send_bytes(sess, b"abc")
+    net._send_bytes(sess, b"defg")
+
+    net._flush(sess)
+
+    assert bytes(sock.sent) == b"abcde"
+    assert [bytes(c) for c in sess.send_queue] == [b"fg"]
+    assert sess.send_queued == 2 and sess.want_write
+
+    sock.limit = 1024
+    net._flush(sess)
+
+    assert bytes(sock.sent) == b"abcdefg"
+    assert not sess.send_queue and sess.send_queued == 0
+    assert not sess.want_write
+
+
+def test_flush_disconnects_session_that_stops_reading(server, monkeypatch):
+    """Queued output beyond MAX_SEND_QUEUE_BYTES closes the session."""
+    monkeypatch.setattr(server, "MAX_SEND_QUEUE_BYTES", 8)
+    net = server.NetworkServer("127.0.0.1", 0)
+    net._sel = mock.Mock()
+    sess = server.ClientSession(_FakeSock(limit=0), ("127.0.0.1", 1))
+    net.sessions[sess.addr] = sess
+
+    net._send_bytes(sess, b"12345")
+    net._flush(sess)
+    assert not sess.closed
+
+    net._send_bytes(sess, b"67890")
+    net._flush(sess)
+    assert sess.closed
+    assert sess.addr not in net.sessions
+
+
+class _EndlessSock:
+    """Socket stand-in that always has another full buffer of unframed bytes."""
+
+    def __init__(self):
+        self.reads = 0
+
+    def recv_into(self, view):
+        self.reads += 1
+        view[:] = b"z" * len(view)
+        return len(view)
+
+    def close(self):
+        pass
+
+
+def test_on_readable_stops_reading_unframed_stream(server):
+    """Reading stops once unframed data passes MAX_MESSAGE_SIZE in one event."""
+    net = server.NetworkServer("127.0.0.1", 0)
+    net._sel = mock.Mock()
+    sock = _EndlessSock()
+    sess = server.ClientSession(sock, ("127.0.0.1", 1))
+
+    net._on_readable(sess)
+
+    assert sess.closed
+    assert (
+        sock.reads * server.BUFFER_SIZE <= server.MAX_MESSAGE_SIZE + server.BUFFER_SIZE
+    )
+
+
+def _baseline_next_drawer(player_ids, current):
+    """The pre-deque rule: next player in join order, wrapping around."""
+    index = player_ids.index(current) if current in player_ids else -1
+    return player_ids[(index + 1) % len(player_ids)]
+
+
+def test_next_drawer_matches_baseline_rotation(server):
+    """Without a shuffle the deque rotates in the same order as the old index rule."""
+    room = server.GameRoom("1")
+    for pid in ("a", "b", "c", "d"):
+        room.add_player(pid, pid.upper())
+
+    current = None
+    for _ in range(10):
+        expected = _baseline_next_drawer(list(room.players), current)
+        current = room.next_drawer()
+        assert current == expected
+
+
+def test_next_drawer_after_drawer_leaves_mid_round(server):
+    """A departing drawer is dropped from the rotation and the next player follows.
+
+    The old index rule restarted from the first player here, so someone who had
+    already drawn this cycle could draw again.
+    """
+    room = server.GameRoom("1")
+    for pid in ("a", "b", "c"):
+        room.add_player(pid, pid.upper())
+    room.rebuild_drawer_cycle()
+    order = [room.next_drawer() for _ in range(3)]
+    assert sorted(order) == ["a", "b", "c"]
+
+    room.drawer_id = room.next_drawer()
+    assert room.drawer_id == order[0]
+    room.remove_player(order[0])
+
+    assert room.drawer_id is None
+    assert [room.next_drawer() for _ in range(4)] == [order[1], order[2]] * 2
+
+
+def test_kick_and_cleanup_keep_player_indexes_in_sync(server):
+    """Kick moves the target out of room_members; disconnect clears both indexes."""
+    net = server.NetworkServer("127.0.0.1", 0)
+    net._sel = mock.Mock()
+    owner = _connected(server, net, "a", 1)
+    target = _connected(server, net, "b", 2)
+    for sess in (owner, target):
+        sess.sock = _FakeSock(limit=0)
+        net.sessions[sess.addr] = sess
+    net._route_message(owner, server.Message("create_room", {}))
+    net._route_message(target, server.Message("join_room", {"room_id": "1"}))
+    assert net.room_members["1"] == {owner, target}
+    target.send_queue.clear()
+
+    net._route_message(owner, server.Message("kick_player", {"player_id": "b"}))
+
+    # As in the baseline, a kicked player returns to the lobby still connected
+    assert net.room_members["1"] == {owner}
+    assert target.room_id is None
+    assert net.sessions_by_player["b"] is target
+    assert "b" not in net.rooms["1"].players
+    assert any(b"kick_player" in bytes(f) for f in target.send_queue)
+
+    net._cleanup_session(target)
+
+    assert target.closed
+    assert "b" not in net.sessions_by_player
+    assert target.addr not in net.sessions
+    assert net.sessions_by_player["a"] is owner
+
+
+@pytest.mark.parametrize("codec", ["json", "msgpack"])
+def test_server_frames_round_trip_through_client_decoder(server, codec):
+    """Message.to_frame output decodes to the same message on the client."""
+    if codec == "msgpack" and server.msgpack is None:
+        pytest.skip("msgpack not installed")
+    client = NetworkClient()
+    client.codec = codec
+    data = {"room_id": "1", "players": {"p1": {"name": "玩家", "score": 3}}}
+
+    client._buf += server.Message("room_update", data).to_frame(codec) * 2
+    client._drain_frames()
+
+    msgs = [client.events.get_nowait() for _ in range(2)]
+    assert [(m.type, m.data) for m in msgs] == [("room_update", data)] * 2
+    assert client.events.empty() and not client._buf
+
+
+def test_public_state_frame_is_rebuilt_on_state_change(server):
+    """The cached room_update frame is reused until score, drawer or members change."""
+    room = server.GameRoom("1")
+    room.add_player("a", "A")
+    room.add_player("b", "B")
+
+    def frame():
+        return room.public_state_frame("json")
+
+    first = frame()
+    assert frame() is first
+
+    room.players["b"]["score"] += 10
+    scored = frame()
+    assert scored != first
+    assert json.loads(scored)["data"]["players"]["b"]["score"] == 10
+
+    room.drawer_id = "b"
+    drawn = frame()
+    assert drawn != scored and json.loads(drawn)["data"]["drawer_id"] == "b"
+
+    room.add_player("c", "C")
+    joined = frame()
+    assert joined != drawn and "c" in json.loads(joined)["data"]["players"]
+
+    room.remove_player("a")
+    left = frame()
+    assert left != joined and "a" not in json.loads(left)["data"]["players"]
+    assert frame() is left
+
+
+class _FakeListener:
+    """Listening socket stand-in that hands out the given client sockets once."""
+
+    def __init__(self, clients):
+        self.clients = list(clients)
+
+    def accept(self):
+        if not self.clients:
+            raise BlockingIOError
+        return self.clients.pop(0)
+
+
+class _FakeClientSock(_FakeSock):
+    def setblocking(self, flag):
+        pass
+
+    def setsockopt(self, *args):
+        pass
+
+
+def test_pooled_session_starts_clean(server):
+    """A session reused from the pool carries nothing over from its last connection."""
+    net = server.NetworkServer("127.0.0.1", 0)
+    net._sel = mock.Mock()
+    old = _connected(server, net, "a", 1)
+    old.sock = _FakeClientSock(limit=0)
+    net.sessions[old.addr] = old
+    net._route_message(old, server.Message("create_room", {}))
+    old.codec = "msgpack"
+    old.last_draw = {"kind": "line"}
+    old.recv_buf += b'{"partial'
+    old.recv_head = 3
+    net._send_bytes(old, b"pending")
+
+    net._cleanup_session(old)
+    net._recycle_sessions()
+    assert net._session_pool == [old]
+
+    net.sock = _FakeListener([(_FakeClientSock(limit=1024), ("127.0.0.1", 9))])
+    net._accept()
+
+    sess = net.sessions[("127.0.0.1", 9)]
+    assert sess is old and net._session_pool == []
+    assert not sess.closed and sess.addr == ("127.0.0.1", 9)
+    assert sess.player_id is None and sess.player_name is None
+    assert sess.room_id is None and sess.last_draw == {}
+    assert sess.codec == server.CODEC_JSON
+    assert not sess.recv_buf and sess.recv_head == 0
+    assert not sess.send_queue and sess.send_queued == 0
+    assert not sess.want_write
+    assert not any(sess in members for members in net.room_members.values())
@@ -0,0 +1,54 @@
+"""
+Tests for the server game room.
+"""
+
+from src.server.game import GameRoom
+
+
+def test_normalize_ignores_case_space_and_punctuation():
+    """Guess normalization drops whitespace and ASCII/CJK punctuation."""
+    assert GameRoom.normalize(" Apple！ ") == "apple"
+    assert GameRoom.normalize("苹 果。") == "苹果"
+    assert GameRoom.normalize(None) == ""
+
+
+def test_submit_guess_matches_normalized_word():
+    """A guess differing only in spacing/punctuation still scores."""
+    room = GameRoom("1")
+    room.add_player("drawer", "D")
+    room.add_player("guesser", "G")
+    room.start_game()
+    guesser = "guesser" if room.drawer_id == "drawer" else "drawer"
+
+    ok, score = room.submit_guess(guesser, f" {room.current_word}！")
+
+    assert ok
+    assert score == 10
+    assert room.players[guesser]["score"] == 10
+    assert room.submit_guess(room.drawer_id, room.current_word) == (False, 0)
+
+
+def test_masked_word_follows_current_word():
+    """The mask is computed when a word is picked and cleared with it."""
+    room = GameRoom("1")
+    room.add_player("p1", "P")
+    assert room.masked_word() == ""
+
+    room.start_game()
+    assert room.masked_word() == "*" * len(room.current_word)
+
+    room.start_rest()
+    assert room.masked_word() == ""
+
+
+def test_submit_guess_reuses_caller_normalization():
+    """A precomputed normalized guess is used as-is instead of the raw text."""
+    room = GameRoom("1")
+    room.add_player("drawer", "D")
+    room.add_player("guesser", "G")
+    room.start_game()
+    guesser = "guesser" if room.drawer_id == "drawer" else "drawer"
+
+    assert room.submit_guess(
+        guesser, "wrong", normalized=GameRoom.normalize(room.current_word)
+    ) == (True, 10)
@@ -0,0 +1,121 @@
+"""
+Tests for shared protocol helpers.
+"""
+
+import base64
+import sys
+from array import array
+
+import pytest
+
+from src.shared.protocols import (
+    Message,
+    apply_draw_delta,
+    msgpack,
+    pack_draw_action,
+    pack_draw_runs,
+    unpack_draw_points,
+)
+
+
+def test_apply_draw_delta_full_action():
+    """A delta against an empty cache carries the whole action."""
+    delta = {
+        "kind": "line",
+        "from": [1, 2],
+        "to": [3, 4],
+        "color": [0, 0, 0],
+        "size": 5,
+        "mode": "draw",
+    }
+
+    assert apply_draw_delta({}, delta) == delta
+
+
+def test_apply_draw_delta_continues_line():
+    """Omitted fields come from the previous action; dx/dy are relative to its end."""
+    last = {
+        "kind": "line",
+        "from": [1, 2],
+        "to": [3, 4],
+        "color": [255, 0, 0],
+        "size": 5,
+        "mode": "draw",
+    }
+
+    action = apply_draw_delta(last, {"dx": 2, "dy": -1})
+
+    assert action["kind"] == "line"
+    assert action["from"] == [3, 4]
+    assert action["to"] == [5, 3]
+    assert action["color"] == [255, 0, 0]
+    assert action["size"] == 5
+
+
+def test_unpack_draw_points():
+    """xy packs little-endian int16 xs followed by ys."""
+    xs = array("h", [1, -2, 300])
+    ys = array("h", [4, 5, -600])
+    if sys.byteorder == "big":
+        xs.byteswap()
+        ys.byteswap()
+    xy = base64.b64encode(xs.tobytes() + ys.tobytes()).decode("ascii")
+
+    assert unpack_draw_points(xy) == [(1, 4), (-2, 5), (300, -600)]
+
+
+@pytest.mark.skipif(msgpack is None, reason="msgpack not installed")
+def test_message_from_msgpack():
+    """MessagePack frame bodies decode to the same message as JSON."""
+    body = msgpack.packb(
+        {"type": "chat", "data": {"text": "你好", "by": "p1"}}, use_bin_type=True
+    )
+
+    msg = Message.from_msgpack(body)
+
+    assert msg.type == "chat"
+    assert msg.data == {"text": "你好", "by": "p1"}
+
+
+def test_pack_draw_action_positional():
+    """line/paint pack to fixed-length int lists; other kinds stay dicts."""
+    line = {
+        "kind": "line",
+        "from": (1, 2),
+        "to": (3, 4),
+        "color": (5, 6, 7),
+        "size": 8,
+        "mode": "erase",
+    }
+    paint = {
+        "kind": "paint",
+        "pos": (1, 2),
+        "color": (5, 6, 7),
+        "size": 8,
+        "mode": "draw",
+    }
+
+    assert pack_draw_action(line) == [1, 1, 2, 3, 4, 5, 6, 7, 8, 1]
+    assert pack_draw_action(paint) == [2, 1, 2, 5, 6, 7, 8, 0]
+    assert pack_draw_action({"kind": "clear", "bg_color": (255, 255, 255)}) is None
+
+
+def test_pack_draw_runs_merges_continuous_lines():
+    """Connected same-style lines become one int16 run; other actions pass through."""
+    lines = [[1, i, i, i + 1, i + 1, 0, 0, 0, 5, 0] for i in range(3)]
+    paint = [2, 9, 9, 0, 0, 0, 5, 0]
+
+    packed = pack_draw_runs(lines + [paint])
+
+    assert len(packed) == 2
+    assert packed[0][:6] == [3, 0, 0, 0, 5, 0]
+    assert unpack_draw_points(packed[0][6]) == [(0, 0), (1, 1), (2, 2), (3, 3)]
+    assert packed[1] == paint
+    assert pack_draw_runs(lines[:1]) == lines[:1]
+
+
+def test_message_to_bytes_falls_back_past_int64():
+    """Integers orjson cannot encode still serialize through stdlib json."""
+    msg = Message("room_update", {"score": 10**30})
+
+    assert msg.to_bytes() == b'{"type": "room_update", "data": {"score": %d}}' % 10**30
@@ -8,7 +8,7 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent))
 
 from src.client.network import NetworkClient
-from src.shared.protocols import Message
+from src.shared.protocols import Message, apply_draw_delta
 import time
 import threading
 
@@ -69,9 +69,14 @@ def test_draw_sync():
         draw_sync_found = False
         for event in events:
             print(f"  收到消息类型: {event.type}, 数据: {event.data}")
-            if event.type == "draw_sync":
+            if event.type in ("draw_sync", "draw_sync_batch"):
                 draw_sync_found = True
                 data = event.data
+                if event.type == "draw_sync_batch":
+                    # 服务器按帧合并广播，取批次中的第一笔并还原增量
+                    data = (data.get("strokes") or [{}])[0]
+                    if "d" in data:
+                        data = {"by": data.get("by"), "data": apply_draw_delta({}, data["d"])}
                 if data.get("by") == "player_1":
                     print(f"  ✓ 正确收到来自玩家1的绘画同步!")
                     draw_data = data.get("data", {})